@@ -5,9 +5,11 @@ Generates missing images, uploads them, fixes all text, replaces all images
 """
 import base64
 import re
-import xmlrpc.client
 from pathlib import Path
 
+from odoo_ready import wait_for_odoo
+from rpc_tracing import report_rpc_metrics, traced_proxy
+
 # Bearings Inc Content
 BEARINGS_CONTENT = {
     'hero_title': 'Precision Bearings for Industrial Excellence',
@@ -50,11 +52,11 @@ BEARINGS_CONTENT = {
 
 def connect_odoo(url, db, username, password):
     """Connect to Odoo"""
-    common = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/common')
+    common = traced_proxy(f'{url}/xmlrpc/2/common')
     uid = common.authenticate(db, username, password, {})
     if not uid:
         raise Exception("Authentication failed")
-    models = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/object')
+    models = traced_proxy(f'{url}/xmlrpc/2/object')
     return uid, models
 
 
@@ -206,7 +208,9 @@ def main():
     PASSWORD = "admin"
     
     try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
         fixes = fix_all_content(URL, DB, USERNAME, PASSWORD)
+        report_rpc_metrics()
         
         print("\n✅ Complete website automation finished!")
         print(f"   Total changes: {len(fixes)}")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Bearings Inc - Command Line
+One entry point for the catalog and website scripts. Subcommands import
+their modules only when they run, and calls go through the session daemon
+when one is running.
+
+    python3 bearings.py daemon start
+    python3 bearings.py import --products-file data/bearing_products.json
+    python3 bearings.py fix --content
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+DAEMON_LOG = Path('logs/bearings_daemon.log')
+# session_daemon.PID_FILE, checked here without importing the daemon
+DAEMON_PID_FILE = Path('.bearings_daemon.pid')
+
+
+def connection(args):
+    return args.url, args.db, args.username, args.password
+
+
+def ready(args):
+    if not args.no_wait:
+        from odoo_ready import wait_for_odoo
+        wait_for_odoo(*connection(args))
+
+
+def cmd_select(args):
+    from select_bearing_products import BASE_DIR, select_products
+    select_products(args.inventory, args.output, args.limit, args.base_dir or BASE_DIR)
+
+
+def cmd_import(args):
+    from import_products import import_products
+    from rpc_tracing import report_rpc_metrics
+    from warm_cache import odoo_now, warm_after_push
+    
+    ready(args)
+    started = odoo_now()
+    imported, errors = import_products(*connection(args), args.products_file)
+    report_rpc_metrics()
+    if imported and not args.no_warm:
+        warm_after_push(*connection(args), since=started)
+    return imported > 0
+
+
+def cmd_configure(args):
+    from configure_website import configure_website
+    from rpc_tracing import report_rpc_metrics
+    
+    ready(args)
+    uploaded = configure_website(*connection(args))
+    report_rpc_metrics()
+    return bool(uploaded)
+
+
+def cmd_fix(args):
+    from rpc_tracing import report_rpc_metrics
+    
+    ready(args)
+    if args.content:
+        from automate_website import fix_all_content
+        fix_all_content(*connection(args))
+        result = True
+    else:
+        from fix_website import fix_website
+        result = bool(fix_website(*connection(args)))
+    report_rpc_metrics()
+    return result
+
+
+def cmd_diagnose(args):
+    import diagnose_website
+    sys.argv = ['diagnose_website.py', '--url', args.url, *args.options]
+    diagnose_website.main()
+
+
+def cmd_optimize(args):
+    from optimize_website import optimize_website
+    
+    ready(args)
+    optimize_website(*connection(args))
+
+
+def cmd_daemon(args):
+    from session_daemon import PID_FILE, read_status, serve
+    
+    address = f'http://127.0.0.1:{args.port}'
+    status = read_status(address, timeout=0.5)
+    
+    if args.action == 'run':
+        serve(args.port, upstreams=[args.url])
+        return True
+    
+    if args.action == 'status':
+        if not status:
+            print("⚪ Session daemon is not running")
+            return False
+        print(f"🟢 Session daemon on {address} (pid {status['pid']}, up {status['uptime_seconds']}s)")
+        print(f"   Calls: {status['calls']}, auth cache hits: {status['auth_hits']}, "
+              f"metadata cache hits: {status['cache_hits']}, errors: {status['errors']}")
+        print(f"   Allowed upstreams: {', '.join(status['allowed_upstreams'])}")
+        for url, pool in status['upstreams'].items():
+            print(f"   {url}: {pool['connections']} connections opened, {pool['idle']} idle")
+        return True
+    
+    if args.action == 'start':
+        if status:
+            print(f"✅ Session daemon already running on {address}")
+            if args.url.rstrip('/') not in status['allowed_upstreams']:
+                print(f"⚠️  It does not forward to {args.url}; stop and start it with this --url")
+            return True
+        DAEMON_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(DAEMON_LOG, 'a') as log:
+            subprocess.Popen(
+                [sys.executable, str(ROOT / 'session_daemon.py'), '--port', str(args.port),
+                 '--upstream', args.url],
+                stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+            )
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if read_status(address, timeout=0.5):
+                print(f"✅ Session daemon started on {address}")
+                return True
+            time.sleep(0.1)
+        print(f"❌ Session daemon did not start, see {DAEMON_LOG}")
+        return False
+    
+    # stop
+    if not status:
+        print("⚪ Session daemon is not running")
+        return True
+    os.kill(status['pid'], signal.SIGTERM)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and read_status(address, timeout=0.5):
+        time.sleep(0.1)
+    if os.path.exists(PID_FILE):
+        os.remove(PID_FILE)
+    print(f"✅ Session daemon stopped after {status['calls']} calls")
+    return True
+
+
+def use_running_daemon(port, url):
+    """Route RPC through a local daemon when one was started from here for url"""
+    if os.environ.get('BEARINGS_DAEMON') or not DAEMON_PID_FILE.exists():
+        return
+    from session_daemon import read_status
+    address = f'http://127.0.0.1:{port}'
+    status = read_status(address, timeout=0.5)
+    if status and url.rstrip('/') in status.get('allowed_upstreams', []):
+        os.environ['BEARINGS_DAEMON'] = address
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=os.environ.get('BEARINGS_URL', 'http://localhost:8069'))
+    parser.add_argument('--db', default=os.environ.get('BEARINGS_DB', 'bearings'))
+    parser.add_argument('--username', default=os.environ.get('BEARINGS_USERNAME', 'admin'))
+    parser.add_argument('--password', default=os.environ.get('BEARINGS_PASSWORD', 'admin'))
+    parser.add_argument('--no-wait', action='store_true', help='Skip the Odoo readiness check')
+    parser.add_argument('--port', type=int, default=8170, help='Session daemon port')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    select = commands.add_parser('select', help='Select products with photos from an inventory CSV')
+    select.add_argument('inventory')
+    select.add_argument('--output', default='data/bearing_products.json')
+    select.add_argument('--limit', type=int, default=20)
+    select.add_argument('--base-dir', help='Root that Image_Path values are relative to')
+    select.set_defaults(func=cmd_select)
+    
+    products = commands.add_parser('import', help='Import products into Odoo')
+    products.add_argument('--products-file', default='data/bearing_products.json')
+    products.add_argument('--no-warm', action='store_true', help='Skip storefront cache warming')
+    products.set_defaults(func=cmd_import)
+    
+    commands.add_parser('configure', help='Upload website images and settings').set_defaults(func=cmd_configure)
+    
+    fix = commands.add_parser('fix', help='Fix website views and placeholder content')
+    fix.add_argument('--content', action='store_true', help='Replace placeholder content on every page')
+    fix.set_defaults(func=cmd_fix)
+    
+    diagnose = commands.add_parser('diagnose', help='Diagnose, audit or watch the storefront')
+    diagnose.add_argument('options', nargs=argparse.REMAINDER, help='Options for diagnose_website.py')
+    diagnose.set_defaults(func=cmd_diagnose)
+    
+    commands.add_parser('optimize', help='Run the website optimizer').set_defaults(func=cmd_optimize)
+    
+    daemon = commands.add_parser('daemon', help='Manage the local session daemon')
+    daemon.add_argument('action', choices=['start', 'stop', 'status', 'run'])
+    daemon.set_defaults(func=cmd_daemon)
+    
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    
+    # Scripts resolve data, assets and state from the repository root
+    for name in ('inventory', 'output', 'base_dir', 'products_file'):
+        if getattr(args, name, None):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    os.chdir(ROOT)
+    if args.command != 'daemon':
+        use_running_daemon(args.port, args.url)
+    
+    try:
+        result = args.func(args)
+    except Exception as e:
+        print(f"\n❌ Fatal error: {str(e)}")
+        exit(1)
+    exit(0 if result is not False else 1)
+
+
+if __name__ == '__main__':
+    main()
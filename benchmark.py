@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Bearings Inc
+Times the import, content fix, configuration and selector scripts against a
+local fake Odoo on generated catalogs, and compares results with a baseline
+"""
+import argparse
+import base64
+import contextlib
+import csv
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import rpc_tracing
+from automate_website import fix_all_content
+from configure_website import configure_website
+from fake_odoo import FakeOdoo, seed_website, start_fake_odoo
+from import_products import import_products
+from select_bearing_products import select_products
+
+BASELINE_FILE = Path('benchmarks/baseline.json')
+DEFAULT_SIZES = [20, 10_000, 1_000_000]
+BRANDS = ['FAG', 'SKF', 'NACHI', 'NTN', 'SW', 'MRC']
+
+# 1x1 transparent PNG used as the product photo in generated catalogs
+PIXEL_PNG = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII='
+)
+
+
+def generate_catalog(path, size, image_path):
+    """Write a bearing_products.json-style catalog with size products"""
+    products = [
+        {
+            'sku': f'BENCH-{i:07d}',
+            'name': f'{BRANDS[i % len(BRANDS)]} Bearing BENCH-{i:07d}',
+            'price': round(10 + (i % 1000) * 0.37, 2),
+            'description': f'High-quality {BRANDS[i % len(BRANDS)]} bearing. SKU: BENCH-{i:07d}',
+            'image_path': str(image_path),
+            'category': 'Ball Bearings',
+            'brand': BRANDS[i % len(BRANDS)],
+        }
+        for i in range(size)
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'products': products, 'total': size}, f)
+
+
+def generate_inventory(path, size, image_name):
+    """Write an inventory CSV in the format select_bearing_products reads"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['SKU', 'Brand', 'Price', 'Image_Path'])
+        for i in range(size):
+            writer.writerow([f'BENCH-{i:07d}', BRANDS[i % len(BRANDS)],
+                             f'${10 + (i % 1000) * 0.37:,.2f}', image_name])
+
+
+def timed(func, items=None):
+    """Run func with stdout silenced, returning timing and RPC usage"""
+    rpc_tracing.tracer.reset()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+    
+    calls = rpc_tracing.tracer.calls
+    result = {
+        'seconds': round(seconds, 4),
+        'rpc_calls': len(calls),
+        'rpc_bytes': sum(c['request_bytes'] + c['response_bytes'] for c in calls),
+    }
+    if items:
+        result['items'] = items
+        result['items_per_second'] = round(items / seconds, 1) if seconds else None
+    return result
+
+
+def run_benchmarks(sizes, rpc_limit, latency, workdir):
+    """Run every benchmark and return results keyed by benchmark name"""
+    workdir = Path(workdir)
+    image_path = workdir / 'product.png'
+    image_path.write_bytes(PIXEL_PNG)
+    results = {}
+    
+    def report(name, result):
+        results[name] = result
+        rate = f", {result['items_per_second']}/s" if result.get('items_per_second') else ''
+        print(f"   {name:<28} {result['seconds']:>9.3f}s  {result['rpc_calls']:>8} RPC calls{rate}")
+    
+    def fresh_server(views=0):
+        odoo = FakeOdoo(latency=latency)
+        seed_website(odoo, views)
+        return start_fake_odoo(odoo)
+    
+    for size in sizes:
+        # Selector: pure local work, runs at every size
+        inventory = workdir / f'inventory_{size}.csv'
+        generate_inventory(inventory, size, image_path.name)
+        report(f'select_products[{size}]', timed(
+            lambda: select_products(inventory, workdir / f'selected_{size}.json', size, workdir),
+            size
+        ))
+        
+        if size > rpc_limit:
+            print(f"   {'RPC benchmarks [' + str(size) + ']':<28} skipped (raise --rpc-limit to run)")
+            continue
+        
+        catalog = workdir / f'catalog_{size}.json'
+        generate_catalog(catalog, size, image_path)
+        server = fresh_server()
+        report(f'import_products[{size}]', timed(
+            lambda: import_products(server.url, 'bearings', 'admin', 'admin', catalog), size
+        ))
+        server.shutdown()
+        
+        server = fresh_server(views=size)
+        report(f'fix_all_content[{size} views]', timed(
+            lambda: fix_all_content(server.url, 'bearings', 'admin', 'admin'), size
+        ))
+        server.shutdown()
+    
+    server = fresh_server()
+    report('configure_website', timed(
+        lambda: configure_website(server.url, 'bearings', 'admin', 'admin')
+    ))
+    server.shutdown()
+    
+    return results
+
+
+def best_of(runs):
+    """Keep the fastest result of each benchmark across repeated runs"""
+    best = {}
+    for results in runs:
+        for name, result in results.items():
+            if name not in best or result['seconds'] < best[name]['seconds']:
+                best[name] = result
+    return best
+
+
+def compare_with_baseline(results, baseline, tolerance, min_delta=0.05):
+    """List regressions: slower beyond tolerance, or more RPC calls"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        slower = result['seconds'] - previous['seconds']
+        if result['seconds'] > previous['seconds'] * (1 + tolerance) and slower > min_delta:
+            regressions.append(f"{name}: {previous['seconds']}s → {result['seconds']}s")
+        if result['rpc_calls'] > previous['rpc_calls']:
+            regressions.append(f"{name}: {previous['rpc_calls']} → {result['rpc_calls']} RPC calls")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Comma-separated catalog sizes')
+    parser.add_argument('--rpc-limit', type=int, default=10_000,
+                        help='Largest catalog to push through the fake Odoo')
+    parser.add_argument('--latency', type=float, default=0.0, help='Fake Odoo per-call latency (s)')
+    parser.add_argument('--baseline', default=str(BASELINE_FILE))
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--require-baseline', action='store_true', default=bool(os.environ.get('CI')),
+                        help='Fail when there is no baseline to compare with (default when CI is set)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark (best is kept)')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before a benchmark counts as regressed')
+    parser.add_argument('--output', help='Write results as JSON')
+    args = parser.parse_args()
+    
+    # Scripts resolve assets relative to the repository root
+    os.chdir(Path(__file__).parent)
+    os.environ.setdefault('BEARINGS_TRACE', '1')
+    
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    
+    print("⏱️  Bearings Inc - Benchmarks")
+    print("=" * 70)
+    
+    runs = []
+    for i in range(args.repeat):
+        if args.repeat > 1:
+            print(f"\n🔁 Run {i + 1}/{args.repeat}")
+        with tempfile.TemporaryDirectory() as workdir:
+            runs.append(run_benchmarks(sizes, args.rpc_limit, args.latency, workdir))
+    results = best_of(runs)
+    
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(run, indent=2))
+        print(f"\n📁 Results saved to: {args.output}")
+    
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        stored = json.loads(baseline_path.read_text()) if baseline_path.exists() else {'results': {}}
+        stored['results'].update(results)
+        stored.update({k: v for k, v in run.items() if k != 'results'})
+        baseline_path.write_text(json.dumps(stored, indent=2))
+        print(f"\n📁 Baseline updated: {baseline_path}")
+        exit(0)
+    
+    if not baseline_path.exists():
+        if args.require_baseline:
+            print(f"\n❌ No baseline at {baseline_path} (run with --save-baseline)")
+            exit(1)
+        print(f"\n⚠️  No baseline at {baseline_path} (run with --save-baseline)")
+        exit(0)
+    
+    regressions = compare_with_baseline(
+        results, json.loads(baseline_path.read_text())['results'], args.tolerance
+    )
+    if regressions:
+        print("\n❌ Regressions:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        exit(1)
+    
+    print("\n✅ No regressions against baseline")
+    exit(0)
+
+
+if __name__ == '__main__':
+    main()
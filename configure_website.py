@@ -3,37 +3,52 @@
 Configure Bearings Inc Website with Images
 Upload images and configure Odoo website theme
 """
-import base64
-import xmlrpc.client
+import argparse
 from pathlib import Path
 
+from odoo_ready import wait_for_odoo
+from rpc_tracing import report_rpc_metrics, traced_proxy
+from streaming_upload import StreamedFile
+
 
 def connect_odoo(url, db, username, password):
     """Connect to Odoo"""
-    common = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/common')
+    common = traced_proxy(f'{url}/xmlrpc/2/common')
     uid = common.authenticate(db, username, password, {})
     
     if not uid:
         raise Exception("Authentication failed")
     
-    models = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/object')
+    models = traced_proxy(f'{url}/xmlrpc/2/object')
     return uid, models
 
 
+# Attachment name → file in assets/images; pages link these attachments by ID
+SITE_IMAGES = {
+    'hero_banner': 'bearings_hero_banner_1768368003121.png',
+    'logo': 'bearings_inc_logo_1768368076425.png',
+    'ball_bearings': 'ball_bearings_category_1768368016447.png',
+    'roller_bearings': 'roller_bearings_category_1768368030440.png',
+    'thrust_bearings': 'thrust_bearings_category_1768368048286.png',
+    'special_bearings': 'special_bearings_category_1768368061926.png',
+    'icon_shipping': 'icon_fast_shipping_1768368089437.png',
+    'icon_quality': 'icon_quality_guarantee_1768368102321.png',
+    'icon_support': 'icon_support_1768368114519.png',
+    'icon_premium': 'icon_premium_quality_1768368126660.png',
+}
+
+
 def upload_image(models, db, uid, password, image_path, name):
     """Upload image to Odoo as attachment"""
     print(f"   📤 Uploading {name}...")
     
-    with open(image_path, 'rb') as f:
-        image_data = base64.b64encode(f.read()).decode('utf-8')
-    
     attachment_id = models.execute_kw(
         db, uid, password,
         'ir.attachment', 'create',
         [{
             'name': name,
             'type': 'binary',
-            'datas': image_data,
+            'datas': StreamedFile(image_path),
             'public': True,
             'res_model': 'ir.ui.view',
         }]
@@ -56,21 +71,8 @@ def configure_website(url, db, username, password):
     print("\n📤 Uploading images...")
     images_dir = Path('assets/images')
     
-    images_to_upload = {
-        'hero_banner': 'bearings_hero_banner_1768368003121.png',
-        'logo': 'bearings_inc_logo_1768368076425.png',
-        'ball_bearings': 'ball_bearings_category_1768368016447.png',
-        'roller_bearings': 'roller_bearings_category_1768368030440.png',
-        'thrust_bearings': 'thrust_bearings_category_1768368048286.png',
-        'special_bearings': 'special_bearings_category_1768368061926.png',
-        'icon_shipping': 'icon_fast_shipping_1768368089437.png',
-        'icon_quality': 'icon_quality_guarantee_1768368102321.png',
-        'icon_support': 'icon_support_1768368114519.png',
-        'icon_premium': 'icon_premium_quality_1768368126660.png',
-    }
-    
     uploaded = {}
-    for key, filename in images_to_upload.items():
+    for key, filename in SITE_IMAGES.items():
         image_path = images_dir / filename
         if image_path.exists():
             attachment_id = upload_image(models, db, uid, password, image_path, key)
@@ -111,7 +113,7 @@ def configure_website(url, db, username, password):
     # Summary
     print("\n" + "=" * 70)
     print("📊 Configuration Summary:")
-    print(f"   Images uploaded: {len(uploaded)}/10")
+    print(f"   Images uploaded: {len(uploaded)}/{len(SITE_IMAGES)}")
     print("\n✅ Website configuration complete!")
     print("\n🔗 Next steps:")
     print("   1. Go to http://localhost:8069")
@@ -123,6 +125,13 @@ def configure_website(url, db, username, password):
 
 
 def main():
+    from warm_cache import warm_after_push
+    
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--warm-products', action='store_true',
+                        help='Also warm every product page and image after the upload')
+    args = parser.parse_args()
+    
     # Configuration
     URL = "http://localhost:8069"
     DB = "bearings"
@@ -130,15 +139,20 @@ def main():
     PASSWORD = "admin"
     
     try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
         uploaded = configure_website(URL, DB, USERNAME, PASSWORD)
+        report_rpc_metrics()
         
         if uploaded:
+            # Site images show on the home, shop and category pages; product
+            # pages only need warming when asked for, not on every run
+            warm_after_push(URL, DB, USERNAME, PASSWORD, product_pages=args.warm_products)
             print("\n✅ Configuration completed successfully!")
             exit(0)
         else:
             print("\n⚠️  Some images failed to upload")
             exit(1)
-            
+    
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
         exit(1)
@@ -3,52 +3,71 @@
 Diagnose and Optimize Bearings Inc Website
 Standalone script - analyzes website and provides recommendations
 """
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import gzip
+import hashlib
+import http.client
+import json
+import re
+import socket
+import ssl
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
 
+from odoo_ready import wait_for_odoo
+from page_parser import BACKENDS, PLACEHOLDERS, parse_page, scan_placeholders
 
-def diagnose_website(url):
+# Thresholds used by the performance audit
+MAX_IMAGE_BYTES = 200 * 1024
+GRID_PAGE_TYPES = ('shop', 'category')
+
+# Watch mode settings
+STATE_FILE = '.diagnose_state.json'
+LATENCY_REGRESSION_FACTOR = 1.5
+LATENCY_REGRESSION_MIN_MS = 100
+# Per-request tokens that change the HTML without changing the page
+VOLATILE_PATTERN = re.compile(r'(csrf_token["\']?\s*[:=]\s*["\'])[^"\']*')
+
+
+def diagnose_website(url, parser=None):
     """Diagnose website issues"""
     print(f"🔍 Diagnosing website: {url}")
     print("=" * 70)
     
+    # Only the basic diagnosis needs requests; audit and watch modes do not
+    import requests
+    
     issues = []
     recommendations = []
     
     try:
         # Fetch homepage
         response = requests.get(url, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        page = parse_page(response.content, parser)
         
         print("\n📄 Homepage Analysis:")
         
         # Check title
-        title = soup.find('title')
-        if title:
-            print(f"   Title: {title.text}")
+        if page['title']:
+            print(f"   Title: {page['title']}")
         
         # Check for placeholder text
-        text_content = soup.get_text()
-        placeholders = {
-            'hello@mycompany.com': 'Email placeholder',
-            '+1 555-555-5556': 'Phone placeholder',
-            'Lorem ipsum': 'Lorem ipsum text',
-        }
-        
         print("\n⚠️  Issues Found:")
-        for placeholder, description in placeholders.items():
-            if placeholder.lower() in text_content.lower():
-                issues.append(description)
-                print(f"   - {description}: {placeholder}")
-                recommendations.append(f"Replace {placeholder} with real content")
+        for placeholder in scan_placeholders(page['text']):
+            description = PLACEHOLDERS[placeholder]
+            issues.append(description)
+            print(f"   - {description}: {placeholder}")
+            recommendations.append(f"Replace {placeholder} with real content")
         
         # Check shop page
         shop_response = requests.get(f'{url}/shop', timeout=10)
-        shop_soup = BeautifulSoup(shop_response.content, 'html.parser')
+        shop_page = parse_page(shop_response.content, parser)
         
         # Count products
-        products = shop_soup.find_all('div', class_='oe_product')
-        product_count = len(products)
+        product_count = shop_page['product_count']
         
         print(f"\n🛍️  Shop Analysis:")
         print(f"   Products found: {product_count}")
@@ -88,20 +107,442 @@ def diagnose_website(url):
             'products': product_count,
             'recommendations': recommendations
         }
-        
+    
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
         return {'error': str(e)}
 
 
+def classify_page(url):
+    """Classify a storefront URL into a page type"""
+    path = urlsplit(url).path.rstrip('/') or '/'
+    
+    if path == '/':
+        return 'home'
+    if path.startswith('/web/image'):
+        return 'image'
+    if path.startswith('/web/assets') or path.endswith(('.js', '.css')):
+        return 'asset'
+    if path.startswith('/shop/category'):
+        return 'category'
+    if path == '/shop' or path.startswith('/shop/page'):
+        return 'shop'
+    if path.startswith('/shop/cart') or path.startswith('/shop/checkout'):
+        return 'checkout'
+    if path.startswith('/shop/'):
+        return 'product'
+    return 'other'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def timed_fetch(url, timeout=10, headers=None, max_redirects=5):
+    """Fetch URL recording DNS, connect, TTFB and total time
+    
+    Returns a (record, body) tuple. The body is decompressed, while the
+    record's 'bytes' field holds the number of bytes actually transferred.
+    Redirects are followed and their time added to 'total_ms'.
+    """
+    parts = urlsplit(url)
+    secure = parts.scheme == 'https'
+    host = parts.hostname
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += f'?{parts.query}'
+    
+    request_headers = {'Accept-Encoding': 'gzip, deflate', 'User-Agent': 'bearings-diagnose'}
+    request_headers.update(headers or {})
+    
+    start = time.perf_counter()
+    address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][4]
+    dns_done = time.perf_counter()
+    
+    sock = socket.create_connection(address[:2], timeout=timeout)
+    if secure:
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    conn.sock = sock
+    connect_done = time.perf_counter()
+    
+    try:
+        conn.request('GET', path, headers=request_headers)
+        response = conn.getresponse()
+        first_byte = time.perf_counter()
+        raw = response.read()
+        done = time.perf_counter()
+    finally:
+        conn.close()
+    
+    location = response.getheader('Location')
+    if response.status in (301, 302, 303, 307, 308) and location and max_redirects > 0:
+        record, body = timed_fetch(urljoin(url, location), timeout, headers, max_redirects - 1)
+        record['redirects'] = record.get('redirects', 0) + 1
+        record['total_ms'] = round(record['total_ms'] + (done - start) * 1000, 2)
+        return record, body
+    
+    encoding = (response.getheader('Content-Encoding') or '').lower()
+    if encoding == 'gzip':
+        body = gzip.decompress(raw)
+    elif encoding == 'deflate':
+        body = zlib.decompress(raw)
+    else:
+        body = raw
+    
+    record = {
+        'url': url,
+        'page_type': classify_page(url),
+        'status': response.status,
+        'dns_ms': round((dns_done - start) * 1000, 2),
+        'connect_ms': round((connect_done - dns_done) * 1000, 2),
+        'ttfb_ms': round((first_byte - connect_done) * 1000, 2),
+        'total_ms': round((done - start) * 1000, 2),
+        'bytes': len(raw),
+        'uncompressed_bytes': len(body),
+        'content_type': response.getheader('Content-Type'),
+        'content_encoding': encoding or None,
+        'cache_control': response.getheader('Cache-Control'),
+        'etag': response.getheader('ETag'),
+        'last_modified': response.getheader('Last-Modified'),
+    }
+    return record, body
+
+
+def extract_assets(base_url, page):
+    """Resolve image, script and stylesheet URLs referenced by a parsed page"""
+    return [(kind, urljoin(base_url, src)) for kind, src in page['assets'] if src]
+
+
+def discover_product_urls(base_url, page, limit=5):
+    """Find product page links on a parsed shop page"""
+    found = []
+    
+    for href in page['links']:
+        href = urljoin(base_url, href)
+        if classify_page(href) == 'product' and href not in found:
+            found.append(href)
+        if len(found) >= limit:
+            break
+    
+    return found
+
+
+def check_page_flags(record, assets):
+    """Flag performance problems on a fetched page and its assets"""
+    flags = []
+    text_types = ('text/', 'application/javascript', 'application/json')
+    
+    if record['status'] >= 400:
+        flags.append(f"HTTP {record['status']}")
+    content_type = record['content_type'] or ''
+    if content_type.startswith(text_types) and not record['content_encoding']:
+        flags.append('Response not compressed')
+    
+    for asset in assets:
+        if asset.get('error'):
+            flags.append(f"Asset failed: {asset['url']} ({asset['error']})")
+            continue
+        if asset['kind'] == 'image':
+            if '/image_1920' in asset['url'] and record['page_type'] in GRID_PAGE_TYPES:
+                flags.append(f"Full-resolution image_1920 in grid: {asset['url']}")
+            if asset['bytes'] > MAX_IMAGE_BYTES:
+                flags.append(f"Oversized image ({asset['bytes'] // 1024} KB): {asset['url']}")
+        if not asset['cache_control'] and not asset['etag']:
+            flags.append(f"No cache headers: {asset['url']}")
+        asset_type = asset['content_type'] or ''
+        if asset_type.startswith(text_types) and not asset['content_encoding']:
+            flags.append(f"Asset not compressed: {asset['url']}")
+    
+    return flags
+
+
+def audit_performance(url, paths=None, samples=3, product_limit=5, output_file=None, parser=None):
+    """Profile storefront pages and write a JSON performance report"""
+    print(f"⏱️  Performance audit: {url}")
+    print("=" * 70)
+    
+    pages = [urljoin(url, path) for path in (paths or ['/', '/shop'])]
+    
+    # Add a few product pages found on the shop grid
+    shop_url = urljoin(url, '/shop')
+    if shop_url in pages:
+        try:
+            _, shop_html = timed_fetch(shop_url)
+            pages.extend(discover_product_urls(shop_url, parse_page(shop_html, parser), product_limit))
+        except Exception as e:
+            print(f"   ⚠️  Could not discover product pages: {str(e)}")
+    
+    asset_cache = {}
+    results = []
+    
+    for page_url in pages:
+        print(f"\n📄 {page_url}")
+        samples_taken = []
+        html = None
+        
+        for _ in range(samples):
+            try:
+                record, body = timed_fetch(page_url)
+            except Exception as e:
+                samples_taken.append({'url': page_url, 'error': str(e)})
+                continue
+            samples_taken.append(record)
+            html = body
+        
+        ok = [s for s in samples_taken if 'error' not in s]
+        if not ok:
+            print(f"   ❌ Failed: {samples_taken[-1]['error']}")
+            results.append({'url': page_url, 'page_type': classify_page(page_url),
+                            'samples': samples_taken, 'flags': ['Page unreachable']})
+            continue
+        
+        # Fetch each referenced asset once per audit
+        assets = []
+        for kind, asset_url in extract_assets(page_url, parse_page(html, parser)):
+            if asset_url not in asset_cache:
+                try:
+                    asset_record, _ = timed_fetch(asset_url)
+                    asset_record['kind'] = kind
+                except Exception as e:
+                    asset_record = {'url': asset_url, 'kind': kind, 'error': str(e)}
+                asset_cache[asset_url] = asset_record
+            assets.append(asset_cache[asset_url])
+        
+        latest = ok[-1]
+        asset_bytes = sum(a.get('bytes', 0) for a in assets)
+        image_bytes = sum(a.get('bytes', 0) for a in assets if a['kind'] == 'image')
+        flags = check_page_flags(latest, assets)
+        
+        page_result = {
+            'url': page_url,
+            'page_type': latest['page_type'],
+            'samples': ok,
+            'html_bytes': latest['bytes'],
+            'asset_bytes': asset_bytes,
+            'image_bytes': image_bytes,
+            'page_weight': latest['bytes'] + asset_bytes,
+            'assets': assets,
+            'flags': flags,
+        }
+        results.append(page_result)
+        
+        print(f"   TTFB: {percentile([s['ttfb_ms'] for s in ok], 50)} ms (p50)")
+        print(f"   Page weight: {page_result['page_weight'] // 1024} KB "
+              f"({len(assets)} assets, {image_bytes // 1024} KB images)")
+        for flag in flags[:5]:
+            print(f"   ⚠️  {flag}")
+        if len(flags) > 5:
+            print(f"   ... and {len(flags) - 5} more")
+    
+    # Aggregate per page type
+    summary = {}
+    for page_type in sorted({r['page_type'] for r in results}):
+        typed = [r for r in results if r['page_type'] == page_type]
+        typed_samples = [s for r in typed for s in r['samples'] if 'error' not in s]
+        stats = {'pages': len(typed)}
+        for metric in ('dns_ms', 'connect_ms', 'ttfb_ms', 'total_ms'):
+            values = [s[metric] for s in typed_samples]
+            stats[metric] = {f'p{p}': percentile(values, p) for p in (50, 95, 99)}
+        weights = [r['page_weight'] for r in typed if 'page_weight' in r]
+        stats['page_weight'] = {f'p{p}': percentile(weights, p) for p in (50, 95, 99)}
+        summary[page_type] = stats
+    
+    report = {
+        'url': url,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'samples_per_page': samples,
+        'summary': summary,
+        'pages': results,
+        'flags': sum(len(r['flags']) for r in results),
+    }
+    
+    print("\n" + "=" * 70)
+    print("📊 Latency by page type (p50 / p95 / p99):")
+    for page_type, stats in summary.items():
+        ttfb = stats['ttfb_ms']
+        print(f"   {page_type}: TTFB {ttfb['p50']} / {ttfb['p95']} / {ttfb['p99']} ms")
+    print(f"   Flags raised: {report['flags']}")
+    
+    if output_file:
+        Path(output_file).write_text(json.dumps(report, indent=2))
+        print(f"\n📁 Report saved to: {output_file}")
+    
+    return report
+
+
+def load_watch_state(state_file):
+    """Load per-URL watch state"""
+    path = Path(state_file)
+    if path.exists():
+        return json.loads(path.read_text())
+    return {}
+
+
+def save_watch_state(state_file, state):
+    """Persist per-URL watch state atomically"""
+    path = Path(state_file)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    tmp.write_text(json.dumps(state, indent=2))
+    tmp.replace(path)
+
+
+def content_hash(body):
+    """Hash page content, ignoring per-request tokens"""
+    text = body.decode('utf-8', errors='replace')
+    return hashlib.sha256(VOLATILE_PATTERN.sub(r'\1', text).encode()).hexdigest()
+
+
+def compare_page(previous, current):
+    """Describe what changed between two analyses of the same page"""
+    changes = []
+    
+    new_placeholders = set(current['placeholders']) - set(previous.get('placeholders', []))
+    for placeholder in sorted(new_placeholders):
+        changes.append(f"New placeholder text: {placeholder}")
+    
+    fixed = set(previous.get('placeholders', [])) - set(current['placeholders'])
+    for placeholder in sorted(fixed):
+        changes.append(f"Placeholder removed: {placeholder}")
+    
+    before = previous.get('product_count')
+    if before is not None and current['product_count'] < before:
+        changes.append(f"Product count dropped: {before} → {current['product_count']}")
+    
+    if previous.get('title') and current['title'] != previous['title']:
+        changes.append(f"Title changed: {previous['title']!r} → {current['title']!r}")
+    
+    return changes
+
+
+def check_page(url, entry, parser=None):
+    """Check one page with a conditional request, re-analyzing only on change"""
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    
+    record, body = timed_fetch(url, headers=headers)
+    changes = []
+    
+    if record['status'] == 304:
+        status = 'not_modified'
+    elif record['status'] >= 400:
+        status = 'error'
+        if entry.get('status') != record['status']:
+            changes.append(f"HTTP {record['status']}")
+    else:
+        digest = content_hash(body)
+        if digest == entry.get('content_hash'):
+            status = 'unchanged'
+        else:
+            status = 'changed'
+            page = parse_page(body, parser)
+            analysis = {
+                'title': page['title'],
+                'product_count': page['product_count'],
+                'placeholders': scan_placeholders(page['text']),
+            }
+            if entry.get('content_hash'):
+                changes.extend(compare_page(entry, analysis))
+            entry.update(analysis)
+            entry['content_hash'] = digest
+        entry['etag'] = record['etag']
+        entry['last_modified'] = record['last_modified']
+    
+    # Compare against a moving latency baseline
+    baseline = entry.get('baseline_ms')
+    latency = record['total_ms']
+    if baseline and latency > baseline * LATENCY_REGRESSION_FACTOR \
+            and latency - baseline > LATENCY_REGRESSION_MIN_MS:
+        changes.append(f"Latency regression: {latency} ms (baseline {baseline} ms)")
+    entry['baseline_ms'] = round(latency if baseline is None else baseline * 0.8 + latency * 0.2, 2)
+    
+    entry['status'] = record['status']
+    entry['checked_at'] = datetime.now(timezone.utc).isoformat()
+    
+    return {'url': url, 'result': status, 'total_ms': latency, 'changes': changes}
+
+
+def watch_website(url, paths=None, interval=300, state_file=STATE_FILE, events_file=None, parser=None):
+    """Incrementally monitor pages, reporting only what changed"""
+    print(f"👀 Watching: {url}")
+    print("=" * 70)
+    
+    pages = [urljoin(url, path) for path in (paths or ['/', '/shop'])]
+    state = load_watch_state(state_file)
+    
+    while True:
+        results = []
+        
+        for page_url in pages:
+            entry = state.setdefault(page_url, {})
+            try:
+                result = check_page(page_url, entry, parser)
+            except Exception as e:
+                result = {'url': page_url, 'result': 'error', 'changes': [f"Unreachable: {str(e)}"]}
+            results.append(result)
+            
+            icon = '⚠️ ' if result['changes'] else '✅'
+            print(f"   {icon} {page_url}: {result['result']}")
+            for change in result['changes']:
+                print(f"      - {change}")
+        
+        save_watch_state(state_file, state)
+        
+        if events_file:
+            timestamp = datetime.now(timezone.utc).isoformat()
+            with open(events_file, 'a') as f:
+                for result in results:
+                    if result['changes']:
+                        f.write(json.dumps({'timestamp': timestamp, **result}) + '\n')
+        
+        if not interval:
+            return {'pages': results, 'changes': sum(len(r['changes']) for r in results)}
+        
+        time.sleep(interval)
+        print(f"\n🔁 {datetime.now().strftime('%H:%M:%S')}")
+
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default="http://localhost:8069")
+    parser.add_argument('--audit', action='store_true', help='Run the performance audit')
+    parser.add_argument('--paths', nargs='*', help='Paths to audit or watch (default: / and /shop)')
+    parser.add_argument('--samples', type=int, default=3, help='Requests per page')
+    parser.add_argument('--output', help='Write the audit report as JSON')
+    parser.add_argument('--watch', action='store_true', help='Incrementally monitor pages')
+    parser.add_argument('--interval', type=int, default=300,
+                        help='Seconds between watch checks (0 checks once)')
+    parser.add_argument('--state', default=STATE_FILE, help='Watch state file')
+    parser.add_argument('--events', help='Append watch changes as JSON lines')
+    parser.add_argument('--parser', choices=['auto'] + BACKENDS, default='auto',
+                        help='HTML parsing backend')
+    args = parser.parse_args()
+    
     print("🎨 Bearings Inc - Website Diagnosis")
     print("=" * 70)
     
-    URL = "http://localhost:8069"
-    
-    result = diagnose_website(URL)
+    if args.watch:
+        result = watch_website(args.url, args.paths, args.interval, args.state,
+                               args.events, args.parser)
+    elif args.audit:
+        wait_for_odoo(args.url)
+        result = audit_performance(args.url, args.paths, args.samples,
+                                   output_file=args.output, parser=args.parser)
+    else:
+        wait_for_odoo(args.url)
+        result = diagnose_website(args.url, args.parser)
     
     if 'error' not in result:
         print("\n✅ Diagnosis complete!")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Catalog Export - Bearings Inc
+Streams products out of Odoo into compressed CSV, XML, JSON lines feeds and
+a sitemap, with incremental exports of only what changed since the last run
+"""
+import argparse
+import csv
+import gzip
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from import_products import connect_odoo, iter_all
+from odoo_ready import wait_for_odoo
+from rpc_tracing import report_rpc_metrics
+
+EXPORT_DIR = Path('exports')
+STATE_FILE = '.export_state.json'
+PAGE_SIZE = 2000
+SITEMAP_LIMIT = 50_000
+FORMATS = ('csv', 'xml', 'jsonl', 'sitemap')
+# Files are written under this prefix and renamed once complete
+TMP_PREFIX = '.tmp-'
+
+PRODUCT_FIELDS = ['default_code', 'name', 'description_sale', 'list_price',
+                  'website_url', 'website_published', 'active', 'write_date']
+FEED_COLUMNS = ['id', 'sku', 'title', 'description', 'price', 'link', 'image_link',
+                'availability', 'updated']
+
+
+def iter_products(models, db, uid, password, since=None, page_size=PAGE_SIZE):
+    """Yield products page by page with a keyset cursor
+    
+    A full export walks id order and only sees published, active products.
+    An incremental export walks (write_date, id) from the since cursor and
+    includes archived and unpublished records so feeds can drop them.
+    """
+    if since is None:
+        yield from iter_all(models, db, uid, password, 'product.template',
+                            [('website_published', '=', True)], PRODUCT_FIELDS, page_size)
+        return
+    
+    write_date, last_id = since
+    while True:
+        page = models.execute_kw(
+            db, uid, password,
+            'product.template', 'search_read',
+            [['|', ('write_date', '>', write_date),
+              '&', ('write_date', '=', write_date), ('id', '>', last_id)]],
+            {'fields': PRODUCT_FIELDS, 'order': 'write_date, id', 'limit': page_size,
+             'context': {'active_test': False}}
+        )
+        yield from page
+        if len(page) < page_size:
+            return
+        write_date, last_id = page[-1]['write_date'], page[-1]['id']
+
+
+def feed_item(product, base_url, currency):
+    """Map a product.template record to a feed row"""
+    available = product['active'] and product['website_published']
+    return {
+        'id': product['id'],
+        'sku': product['default_code'] or '',
+        'title': product['name'],
+        'description': product['description_sale'] or '',
+        'price': f"{product['list_price']:.2f} {currency}",
+        'link': base_url + (product['website_url'] or f"/shop/{product['id']}"),
+        'image_link': f"{base_url}/web/image/product.template/{product['id']}/image_1024",
+        'availability': 'in_stock' if available else 'out_of_stock',
+        'updated': product['write_date'],
+    }
+
+
+class CsvFeed:
+    extension = 'csv.gz'
+    
+    def __init__(self, path):
+        self.files = [path]
+        self.file = gzip.open(path, 'wt', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, FEED_COLUMNS)
+        self.writer.writeheader()
+    
+    def write(self, item):
+        self.writer.writerow(item)
+    
+    def close(self):
+        self.file.close()
+
+
+class JsonlFeed:
+    extension = 'jsonl.gz'
+    
+    def __init__(self, path):
+        self.files = [path]
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+    
+    def write(self, item):
+        self.file.write(json.dumps(item, ensure_ascii=False) + '\n')
+    
+    def close(self):
+        self.file.close()
+
+
+class XmlFeed:
+    """RSS 2.0 product feed with Google merchant g: fields"""
+    extension = 'xml.gz'
+    
+    def __init__(self, path):
+        self.files = [path]
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0">\n'
+                        '<channel>\n<title>Bearings Inc</title>\n')
+    
+    def write(self, item):
+        fields = ''.join(
+            f'<g:{key}>{escape(str(item[key]))}</g:{key}>'
+            for key in ('id', 'title', 'description', 'price', 'link', 'image_link', 'availability')
+        )
+        self.file.write(f'<item>{fields}</item>\n')
+    
+    def close(self):
+        self.file.write('</channel>\n</rss>\n')
+        self.file.close()
+
+
+class Sitemap:
+    """Sitemap files of up to 50,000 URLs plus a sitemap index"""
+    extension = 'xml.gz'
+    
+    def __init__(self, path, base_url=''):
+        self.index = Path(path)
+        self.base_url = base_url
+        self.files = [self.index]
+        self.file = None
+        self.count = 0
+    
+    def _open(self):
+        stem = self.index.name[:-len('.xml.gz')]
+        path = self.index.with_name(f'{stem}-{len(self.files)}.xml.gz')
+        self.files.append(path)
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        self.count = 0
+    
+    def _close_file(self):
+        self.file.write('</urlset>\n')
+        self.file.close()
+        self.file = None
+    
+    def write(self, item):
+        if item['availability'] != 'in_stock':
+            return
+        if self.file is None or self.count >= SITEMAP_LIMIT:
+            if self.file:
+                self._close_file()
+            self._open()
+        lastmod = item['updated'].replace(' ', 'T') + '+00:00'
+        self.file.write(f"<url><loc>{escape(item['link'])}</loc><lastmod>{lastmod}</lastmod></url>\n")
+        self.count += 1
+    
+    def close(self):
+        if self.file:
+            self._close_file()
+        with gzip.open(self.index, 'wt', encoding='utf-8') as index:
+            index.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for path in self.files[1:]:
+                name = path.name.removeprefix(TMP_PREFIX)
+                index.write(f"<sitemap><loc>{escape(self.base_url)}/{name}</loc></sitemap>\n")
+            index.write('</sitemapindex>\n')
+
+
+WRITERS = {'csv': CsvFeed, 'xml': XmlFeed, 'jsonl': JsonlFeed, 'sitemap': Sitemap}
+
+
+def load_state(path=STATE_FILE):
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_state(state, path=STATE_FILE):
+    Path(path).write_text(json.dumps(state, indent=2))
+
+
+def export_catalog(url, db, username, password, formats=FORMATS, incremental=False,
+                   output_dir=EXPORT_DIR, base_url=None, currency='USD',
+                   state_file=STATE_FILE, page_size=PAGE_SIZE):
+    """Export the catalog feeds, or only changes since the previous export"""
+    print("📤 Bearings Inc - Catalog Export")
+    print("=" * 70)
+    
+    base_url = (base_url or url).rstrip('/')
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    state = load_state(state_file)
+    cursor = state.get(db, {}).get('cursor') if incremental else None
+    if incremental and cursor is None:
+        print("\n⚠️  No previous export recorded, running a full export")
+    if cursor:
+        # Sitemaps must list every page, so only full exports write them
+        formats = [f for f in formats if f != 'sitemap']
+        print(f"\n🔁 Exporting changes since {cursor[0]}")
+    
+    print("\n🔌 Connecting to Odoo...")
+    uid, models = connect_odoo(url, db, username, password)
+    print(f"✅ Connected as user ID: {uid}")
+    
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')
+    name = f'catalog-changes-{stamp}' if cursor else 'catalog'
+    writers = []
+    for fmt in formats:
+        writer_class = WRITERS[fmt]
+        # Write next to the final file and rename, so readers never see half a feed
+        path = output_dir / f"{TMP_PREFIX}{'sitemap' if fmt == 'sitemap' else name}.{writer_class.extension}"
+        writers.append(writer_class(path, base_url) if fmt == 'sitemap' else writer_class(path))
+    
+    started = time.perf_counter()
+    exported = 0
+    last_cursor = cursor
+    print(f"\n📦 Streaming products ({', '.join(formats)})...")
+    try:
+        for product in iter_products(models, db, uid, password, cursor, page_size):
+            item = feed_item(product, base_url, currency)
+            for writer in writers:
+                writer.write(item)
+            exported += 1
+            if last_cursor is None or (product['write_date'], product['id']) > tuple(last_cursor):
+                last_cursor = [product['write_date'], product['id']]
+            if exported % 100_000 == 0:
+                print(f"   {exported} products...")
+    finally:
+        for writer in writers:
+            writer.close()
+    
+    outputs = []
+    for writer in writers:
+        for path in writer.files:
+            final = path.with_name(path.name.removeprefix(TMP_PREFIX))
+            path.replace(final)
+            outputs.append(final)
+    
+    # A full export walks id order, so record the newest write_date it saw
+    state[db] = {'cursor': last_cursor, 'exported_at': stamp}
+    save_state(state, state_file)
+    
+    elapsed = time.perf_counter() - started
+    print("\n" + "=" * 70)
+    print("📊 Export Summary:")
+    print(f"   Products: {exported} in {elapsed:.1f}s")
+    for path in outputs:
+        print(f"   📁 {path} ({path.stat().st_size // 1024} KB)")
+    
+    return {'products': exported, 'seconds': round(elapsed, 2), 'files': [str(p) for p in outputs]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--formats', default=','.join(FORMATS), help=f"Comma-separated: {', '.join(FORMATS)}")
+    parser.add_argument('--incremental', action='store_true', help='Only products changed since the last export')
+    parser.add_argument('--output-dir', default=str(EXPORT_DIR))
+    parser.add_argument('--base-url', help='Public storefront URL used in links (default: Odoo URL)')
+    parser.add_argument('--currency', default='USD')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    parser.add_argument('--state', default=STATE_FILE)
+    args = parser.parse_args()
+    
+    URL = "http://localhost:8069"
+    DB = "bearings"
+    USERNAME = "admin"
+    PASSWORD = "admin"
+    
+    formats = [f for f in args.formats.split(',') if f]
+    unknown = [f for f in formats if f not in WRITERS]
+    if unknown:
+        parser.error(f"Unknown formats: {', '.join(unknown)}")
+    
+    try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
+        export_catalog(URL, DB, USERNAME, PASSWORD, formats, args.incremental, args.output_dir,
+                       args.base_url, args.currency, args.state, args.page_size)
+        report_rpc_metrics()
+        exit(0)
+    except Exception as e:
+        print(f"\n❌ Fatal error: {str(e)}")
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
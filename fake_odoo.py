@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Fake Odoo Server - Bearings Inc
+Local stand-in for the Odoo XML-RPC subset used by these scripts
+(common.authenticate, object.execute_kw, db.list), for benchmarks and CI
+"""
+import argparse
+import fnmatch
+import threading
+import time
+import uuid
+from socketserver import ThreadingMixIn
+from xmlrpc.client import Fault
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+BINARY_FIELDS = {'image_1920', 'datas', 'logo'}
+
+
+def _like(value, pattern, case_sensitive):
+    value = '' if value is None or value is False else str(value)
+    if not case_sensitive:
+        value, pattern = value.lower(), pattern.lower()
+    return pattern in value
+
+
+def _compare(value, operator, target):
+    if operator == '=':
+        return value == target
+    if operator == '!=':
+        return value != target
+    if operator == 'in':
+        return value in target
+    if operator == 'not in':
+        return value not in target
+    if operator == 'like':
+        return _like(value, target, True)
+    if operator == 'ilike':
+        return _like(value, target, False)
+    if operator == '=like':
+        return fnmatch.fnmatchcase(str(value), target.replace('%', '*').replace('_', '?'))
+    if value is False or value is None:
+        return False
+    if operator == '>':
+        return value > target
+    if operator == '>=':
+        return value >= target
+    if operator == '<':
+        return value < target
+    if operator == '<=':
+        return value <= target
+    raise Fault(1, f"Unsupported operator: {operator}")
+
+
+def match_domain(record, domain):
+    """Evaluate an Odoo domain (prefix notation) against a record"""
+    def evaluate(position):
+        item = domain[position]
+        if item == '!':
+            result, position = evaluate(position + 1)
+            return not result, position
+        if item in ('&', '|'):
+            left, position = evaluate(position + 1)
+            right, position = evaluate(position)
+            return (left and right) if item == '&' else (left or right), position
+        field, operator, target = item
+        value = record.get(field, False)
+        if isinstance(value, list) and operator in ('=', 'in'):
+            # Many2many/one2many: match when any linked id matches
+            targets = target if isinstance(target, list) else [target]
+            return any(v in targets for v in value), position + 1
+        return _compare(value, operator, target), position + 1
+    
+    # Implicit '&' between top-level terms
+    position, result = 0, True
+    while position < len(domain):
+        term_result, position = evaluate(position)
+        result = result and term_result
+    return result
+
+
+class FakeOdoo:
+    """In-memory model store answering execute_kw calls"""
+    
+    def __init__(self, latency=0.0, store_binary=False, max_payload=None,
+                 users=None):
+        self.latency = latency
+        self.store_binary = store_binary
+        self.max_payload = max_payload
+        self.users = users or {('admin', 'admin'): 2}
+        self.models = {}
+        self.next_id = {}
+        self.calls = 0
+        self.lock = threading.Lock()
+    
+    # Data
+    
+    def table(self, model):
+        return self.models.setdefault(model, {})
+    
+    def _new_id(self, model):
+        self.next_id[model] = self.next_id.get(model, 0) + 1
+        return self.next_id[model]
+    
+    def _clean(self, vals):
+        vals = dict(vals)
+        for field in BINARY_FIELDS & vals.keys():
+            if not self.store_binary and vals[field]:
+                # Keep only the size so large catalogs fit in memory
+                vals[field] = f'<binary {len(vals[field])} bytes>'
+        for field, value in list(vals.items()):
+            if isinstance(value, list) and value and isinstance(value[0], (list, tuple)):
+                vals[field] = self._apply_commands(value)
+        return vals
+    
+    @staticmethod
+    def _apply_commands(commands):
+        ids = []
+        for command in commands:
+            if command[0] == 6:
+                ids = list(command[2])
+            elif command[0] == 4:
+                ids.append(command[1])
+            elif command[0] == 0:
+                ids.append(command[2])
+        return ids
+    
+    def seed(self, model, records):
+        """Insert records directly, bypassing latency and call counting"""
+        table = self.table(model)
+        ids = []
+        for vals in records:
+            record_id = vals.get('id') or self._new_id(model)
+            self.next_id[model] = max(self.next_id.get(model, 0), record_id)
+            table[record_id] = {'active': True, 'write_date': _now(), **vals, 'id': record_id}
+            ids.append(record_id)
+        return ids
+    
+    # RPC services
+    
+    def authenticate(self, db, login, password, user_agent_env):
+        return self.users.get((login, password), False)
+    
+    def version(self):
+        return {'server_version': '18.0', 'server_serie': '18.0', 'protocol_version': 1}
+    
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        if self.latency:
+            time.sleep(self.latency)
+        if uid not in self.users.values():
+            raise Fault(3, "Access Denied")
+        
+        kwargs = kwargs or {}
+        handler = getattr(self, f'_m_{method}', None)
+        if handler is None:
+            raise Fault(2, f"The method '{method}' does not exist on the model '{model}'")
+        
+        with self.lock:
+            self.calls += 1
+            return handler(model, *args, **kwargs)
+    
+    def _search(self, model, domain, offset=0, limit=None, order=None, context=None):
+        context = context or {}
+        records = self.table(model).values()
+        if context.get('active_test', True) and not any(
+                isinstance(t, (list, tuple)) and t[0] == 'active' for t in domain):
+            records = (r for r in records if r.get('active', True))
+        found = [r for r in records if match_domain(r, domain)]
+        
+        if order:
+            for part in reversed([p.strip() for p in order.split(',')]):
+                field, _, direction = part.partition(' ')
+                found.sort(key=lambda r: (r.get(field) is False, r.get(field)),
+                           reverse=direction.lower() == 'desc')
+        else:
+            found.sort(key=lambda r: r['id'])
+        
+        found = found[offset or 0:]
+        if limit:
+            found = found[:limit]
+        return found
+    
+    @staticmethod
+    def _fields(record, fields):
+        if not fields:
+            return dict(record)
+        return {'id': record['id'], **{f: record.get(f, False) for f in fields}}
+    
+    def _m_search(self, model, domain, offset=0, limit=None, order=None, context=None, count=False):
+        found = self._search(model, domain, offset, limit, order, context)
+        return len(found) if count else [r['id'] for r in found]
+    
+    def _m_search_count(self, model, domain, context=None, limit=None):
+        return len(self._search(model, domain, 0, limit, None, context))
+    
+    def _m_search_read(self, model, domain=None, fields=None, offset=0, limit=None, order=None, context=None):
+        found = self._search(model, domain or [], offset, limit, order, context)
+        return [self._fields(r, fields) for r in found]
+    
+    def _m_read(self, model, ids, fields=None, context=None):
+        table = self.table(model)
+        return [self._fields(table[i], fields) for i in ids if i in table]
+    
+    def _m_create(self, model, vals, context=None):
+        many = isinstance(vals, list)
+        created = []
+        for record_vals in (vals if many else [vals]):
+            record_id = self._new_id(model)
+            self.table(model)[record_id] = {
+                'active': True, **self._clean(record_vals), 'id': record_id, 'write_date': _now()
+            }
+            created.append(record_id)
+        return created if many else created[0]
+    
+    def _m_write(self, model, ids, vals, context=None):
+        table = self.table(model)
+        cleaned = self._clean(vals)
+        for record_id in ids:
+            if record_id not in table:
+                raise Fault(4, f"Record does not exist: {model}({record_id})")
+            table[record_id].update(cleaned, write_date=_now())
+        return True
+    
+    def _m_unlink(self, model, ids, context=None):
+        table = self.table(model)
+        for record_id in ids:
+            table.pop(record_id, None)
+        return True
+    
+    def _m_load(self, model, fields, data, context=None):
+        table = self.table(model)
+        ids, messages = [], []
+        for row in data:
+            vals = dict(zip(fields, row))
+            record_id = int(vals.pop('.id'))
+            if record_id not in table:
+                messages.append({'type': 'error', 'message': f"No matching record for id {record_id}"})
+                continue
+            table[record_id].update(self._clean(vals), write_date=_now())
+            ids.append(record_id)
+        return {'ids': ids if not messages else False, 'messages': messages}
+    
+    def _m_get_param(self, model, key, default=False, context=None):
+        for record in self.table(model).values():
+            if record.get('key') == key:
+                return record.get('value', default)
+        return default
+    
+    def _m_fields_get(self, model, allfields=None, attributes=None, context=None):
+        fields = set()
+        for record in self.table(model).values():
+            fields.update(record)
+        return {f: {'type': 'char', 'string': f} for f in sorted(fields)}
+
+
+def _now():
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+
+
+class FakeOdooRequestHandler(SimpleXMLRPCRequestHandler):
+    rpc_paths = ('/xmlrpc/2/common', '/xmlrpc/2/object', '/xmlrpc/2/db')
+    
+    def do_GET(self):
+        # Health and login pages for readiness probes
+        if self.path in ('/web/health', '/web/login'):
+            body = b'{"status": "pass"}'
+            self.send_response(200)
+        else:
+            body = b'Not found'
+            self.send_response(404)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_POST(self):
+        limit = self.server.odoo.max_payload
+        if limit and int(self.headers.get('Content-Length') or 0) > limit:
+            self.send_response(413)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        super().do_POST()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOdooServer(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+    
+    def __init__(self, odoo, port=0, databases=('bearings',)):
+        super().__init__(('127.0.0.1', port), FakeOdooRequestHandler,
+                         logRequests=False, allow_none=True)
+        self.odoo = odoo
+        self.register_function(odoo.authenticate, 'authenticate')
+        self.register_function(odoo.version, 'version')
+        self.register_function(odoo.execute_kw, 'execute_kw')
+        self.register_function(lambda: list(databases), 'list')
+        self.register_function(lambda name: name in databases, 'db_exist')
+    
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+def start_fake_odoo(odoo=None, port=0, **kwargs):
+    """Start a fake Odoo in a background thread and return the server"""
+    server = FakeOdooServer(odoo or FakeOdoo(**kwargs), port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def seed_website(odoo, views=20, placeholder_ratio=0.5):
+    """Seed a website, the media library images and a synthetic view set"""
+    odoo.seed('website', [{'id': 1, 'name': 'My Website'}])
+    odoo.seed('ir.config_parameter', [{'key': 'database.uuid', 'value': str(uuid.uuid4())}])
+    odoo.seed('ir.attachment', [
+        {'id': 878, 'name': 'hero_banner', 'datas': 'aGVybw=='},
+        {'id': 879, 'name': 'logo', 'datas': 'bG9nbw=='},
+    ])
+    
+    placeholder_every = max(1, int(1 / placeholder_ratio)) if placeholder_ratio else 0
+    arch_views = []
+    for i in range(views):
+        body = '<p>Contact us</p>'
+        if placeholder_every and i % placeholder_every == 0:
+            body = '<p>hello@mycompany.com</p><p>+1 555-555-5556</p><section class="s_cover">Shaping our future</section>'
+        arch_views.append({
+            'name': f'Website page {i}',
+            'key': f'website.page_{i}',
+            'type': 'qweb',
+            'website_id': 1,
+            'arch_db': f'<t t-name="website.page_{i}"><div>{body}</div></t>',
+        })
+    odoo.seed('ir.ui.view', arch_views)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8069)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every call')
+    parser.add_argument('--store-binary', action='store_true', help='Keep image payloads in memory')
+    parser.add_argument('--max-payload', type=int, help='Reject request bodies above this size')
+    parser.add_argument('--views', type=int, default=20, help='Synthetic website views to seed')
+    args = parser.parse_args()
+    
+    odoo = FakeOdoo(args.latency, args.store_binary, args.max_payload)
+    seed_website(odoo, args.views)
+    server = FakeOdooServer(odoo, args.port)
+    
+    print(f"🧪 Fake Odoo listening on {server.url} (db: bearings, login: admin/admin)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n✅ Stopped after {odoo.calls} calls")
+
+
+if __name__ == '__main__':
+    main()
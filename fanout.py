@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Multi-Tenant Fan-Out - Bearings Inc
+Runs the import, configure and fix workflows against many Odoo instances and
+databases concurrently, in a pool of worker processes with one log file per
+target
+"""
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+LOG_DIR = Path('logs/fanout')
+
+# Workflow name → (module, function); each takes (url, db, username, password)
+WORKFLOWS = {
+    'import': ('setup', 'import_catalog'),
+    'configure': ('configure_website', 'configure_website'),
+    'fix': ('fix_website', 'fix_website'),
+    'content': ('automate_website', 'fix_all_content'),
+    'warm': ('warm_cache', 'warm_cache'),
+}
+
+# Workflows that fail the target when they return nothing, as in setup.py;
+# import_catalog raises on its own when no product was imported
+CHECKED_WORKFLOWS = {'configure', 'fix'}
+
+
+def load_targets(targets_file):
+    """Load targets, filling each from the file's 'defaults'
+    
+    The file is either a list of targets or {"defaults": {...}, "targets": [...]}.
+    Each target needs url and db; username, password, products_file and name
+    are optional.
+    """
+    with open(targets_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if isinstance(data, list):
+        data = {'targets': data}
+    defaults = {'username': 'admin', 'password': 'admin',
+                'products_file': str(Path(__file__).parent / 'data' / 'bearing_products.json'),
+                **data.get('defaults', {})}
+    
+    targets = []
+    for entry in data['targets']:
+        target = {**defaults, **entry}
+        if not target.get('url') or not target.get('db'):
+            raise Exception(f"Target needs url and db: {entry}")
+        target.setdefault('name', f"{target['db']}@{urlsplit(target['url']).netloc}")
+        targets.append(target)
+    
+    names = [t['name'] for t in targets]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise Exception(f"Duplicate target names: {', '.join(duplicates)}")
+    return targets
+
+
+def summarize_result(workflow, result):
+    """One-line description of what a workflow returned"""
+    if workflow == 'import':
+        imported, errors = result
+        return f"{imported} imported, {len(errors)} errors"
+    if isinstance(result, dict) and 'urls' in result:
+        return f"{result['urls']} URLs warmed"
+    if isinstance(result, (list, dict)):
+        return f"{len(result)} changes"
+    return str(result)
+
+
+def run_target(target, workflows, log_dir, ready_timeout=300):
+    """Run workflows against one target with output sent to its own log
+    
+    Runs in a pooled worker process that may have served other targets
+    before, so the RPC tracer is reset first.
+    """
+    import rpc_tracing
+    from odoo_ready import wait_for_odoo
+    from setup import checked
+    
+    rpc_tracing.tracer.reset()
+    log_path = Path(log_dir) / f"{target['name'].replace('/', '_')}.log"
+    outcome = {'name': target['name'], 'url': target['url'], 'db': target['db'],
+               'status': 'done', 'steps': {}, 'log': str(log_path)}
+    started = time.perf_counter()
+    credentials = (target['url'], target['db'], target['username'], target['password'])
+    
+    with open(log_path, 'w', encoding='utf-8') as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            wait_for_odoo(*credentials, timeout=ready_timeout)
+            for workflow in workflows:
+                module, function = WORKFLOWS[workflow]
+                func = getattr(importlib.import_module(module), function)
+                step_started = time.perf_counter()
+                if workflow == 'import':
+                    result = func(*credentials, target['products_file'])
+                else:
+                    result = func(*credentials)
+                if workflow in CHECKED_WORKFLOWS:
+                    checked(result)
+                outcome['steps'][workflow] = {
+                    'seconds': round(time.perf_counter() - step_started, 2),
+                    'result': summarize_result(workflow, result),
+                }
+        except Exception as e:
+            outcome['status'] = 'failed'
+            outcome['error'] = f"{type(e).__name__}: {str(e)}"
+            print(f"\n❌ {outcome['error']}")
+        rpc_tracing.report_rpc_metrics()
+    
+    calls = rpc_tracing.tracer.calls
+    outcome['rpc_calls'] = len(calls)
+    outcome['rpc_seconds'] = round(sum(c['latency_ms'] for c in calls) / 1000, 2)
+    outcome['seconds'] = round(time.perf_counter() - started, 2)
+    return outcome
+
+
+def fan_out(targets, workflows, concurrency=8, log_dir=LOG_DIR, ready_timeout=300):
+    """Run workflows on every target, at most concurrency at a time"""
+    unknown = [w for w in workflows if w not in WORKFLOWS]
+    if unknown:
+        raise Exception(f"Unknown workflows: {', '.join(unknown)}")
+    
+    run_dir = Path(log_dir) / datetime.now().strftime('%Y%m%d-%H%M%S')
+    run_dir.mkdir(parents=True, exist_ok=True)
+    
+    print(f"\n🚀 Running {' → '.join(workflows)} on {len(targets)} targets "
+          f"({concurrency} at a time)")
+    print(f"   Logs: {run_dir}")
+    
+    started = time.perf_counter()
+    outcomes = []
+    with ProcessPoolExecutor(max_workers=min(concurrency, len(targets)) or 1) as pool:
+        futures = {pool.submit(run_target, t, workflows, run_dir, ready_timeout): t for t in targets}
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                # The worker process itself died
+                outcome = {'name': target['name'], 'url': target['url'], 'db': target['db'],
+                           'status': 'failed', 'error': f"{type(e).__name__}: {str(e)}",
+                           'steps': {}, 'seconds': None, 'rpc_calls': 0, 'rpc_seconds': 0}
+            outcomes.append(outcome)
+            icon = '✅' if outcome['status'] == 'done' else '❌'
+            timing = f"{outcome['seconds']:.1f}s" if outcome['seconds'] is not None else '-'
+            print(f"   {icon} {outcome['name']} ({timing})"
+                  + (f": {outcome['error']}" if outcome.get('error') else ''))
+    
+    wall = time.perf_counter() - started
+    return {'workflows': workflows, 'wall_seconds': round(wall, 2),
+            'targets': sorted(outcomes, key=lambda o: o['name'])}
+
+
+def print_report(report):
+    """Print the aggregated per-target report"""
+    outcomes = report['targets']
+    print("\n" + "=" * 70)
+    print("📊 Fan-Out Report:")
+    print(f"   {'Target':<30} {'Status':<8} {'Time':>8} {'RPC':>7}  Result")
+    for outcome in outcomes:
+        steps = '; '.join(f"{w}: {s['result']}" for w, s in outcome['steps'].items())
+        timing = f"{outcome['seconds']:.1f}s" if outcome['seconds'] is not None else '-'
+        print(f"   {outcome['name']:<30} {outcome['status']:<8} {timing:>8} "
+              f"{outcome['rpc_calls']:>7}  {steps or outcome.get('error', '')}")
+    
+    durations = [o['seconds'] for o in outcomes if o['seconds'] is not None]
+    failed = [o for o in outcomes if o['status'] != 'done']
+    print(f"\n   Targets: {len(outcomes) - len(failed)} done, {len(failed)} failed")
+    if durations:
+        print(f"   ⏱️  Wall clock {report['wall_seconds']:.1f}s, slowest target {max(durations):.1f}s, "
+              f"sequential would take ~{sum(durations):.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('targets', help='JSON file listing url/db targets')
+    parser.add_argument('--workflows', default='import,configure,fix',
+                        help=f"Comma-separated, run in order per target ({', '.join(WORKFLOWS)})")
+    parser.add_argument('--concurrency', type=int, default=8, help='Targets processed at once')
+    parser.add_argument('--only', help='Comma-separated target names to include')
+    parser.add_argument('--ready-timeout', type=float, default=300,
+                        help='Seconds to wait for each target to come up')
+    parser.add_argument('--log-dir', default=str(LOG_DIR))
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args()
+    
+    print("🌐 Bearings Inc - Multi-Tenant Fan-Out")
+    print("=" * 70)
+    
+    try:
+        targets = load_targets(args.targets)
+        if args.only:
+            wanted = set(args.only.split(','))
+            targets = [t for t in targets if t['name'] in wanted]
+        if not targets:
+            raise Exception("No targets selected")
+        
+        # Worker processes resolve assets relative to the repository root,
+        # so paths given on the command line or in the targets file are
+        # made absolute first
+        for target in targets:
+            target['products_file'] = os.path.abspath(target['products_file'])
+        log_dir = os.path.abspath(args.log_dir)
+        output = args.output and os.path.abspath(args.output)
+        os.chdir(Path(__file__).parent)
+        report = fan_out(targets, [w for w in args.workflows.split(',') if w],
+                         args.concurrency, log_dir, args.ready_timeout)
+    except Exception as e:
+        print(f"\n❌ Fatal error: {str(e)}")
+        exit(1)
+    
+    print_report(report)
+    if output:
+        Path(output).write_text(json.dumps(report, indent=2))
+        print(f"\n📁 Report saved to: {output}")
+    
+    exit(0 if all(o['status'] == 'done' for o in report['targets']) else 1)
+
+
+if __name__ == '__main__':
+    main()
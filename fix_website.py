@@ -3,18 +3,19 @@
 Fix Bearings Inc Website - Direct Database Approach
 Edits website content directly in Odoo database
 """
-import xmlrpc.client
+from odoo_ready import wait_for_odoo
+from rpc_tracing import report_rpc_metrics, traced_proxy
 
 
 def connect_odoo(url, db, username, password):
     """Connect to Odoo"""
-    common = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/common')
+    common = traced_proxy(f'{url}/xmlrpc/2/common')
     uid = common.authenticate(db, username, password, {})
     
     if not uid:
         raise Exception("Authentication failed")
     
-    models = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/object')
+    models = traced_proxy(f'{url}/xmlrpc/2/object')
     return uid, models
 
 
@@ -159,7 +160,9 @@ def main():
     PASSWORD = "admin"
     
     try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
         fixes = fix_website(URL, DB, USERNAME, PASSWORD)
+        report_rpc_metrics()
         
         if fixes:
             print("\n✅ Website fixes completed successfully!")
@@ -3,24 +3,51 @@
 Bearings Inc - Product Import Script
 Standalone script to import 20 bearing products
 """
-import base64
 import json
-import xmlrpc.client
 from pathlib import Path
 
+from odoo_ready import wait_for_odoo
+from rpc_tracing import report_rpc_metrics, traced_proxy
+from streaming_upload import StreamedFile
+from taxonomy import TaxonomyResolver
+
 
 def connect_odoo(url, db, username, password):
     """Connect to Odoo"""
-    common = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/common')
+    common = traced_proxy(f'{url}/xmlrpc/2/common')
     uid = common.authenticate(db, username, password, {})
     
     if not uid:
         raise Exception("Authentication failed")
     
-    models = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/object')
+    models = traced_proxy(f'{url}/xmlrpc/2/object')
     return uid, models
 
 
+def iter_all(models, db, uid, password, model, domain, fields, page_size=5000, context=None):
+    """Yield every matching record page by page, paging on id instead of offset"""
+    last_id = 0
+    options = {'fields': fields, 'order': 'id', 'limit': page_size}
+    if context:
+        options['context'] = context
+    while True:
+        page = models.execute_kw(
+            db, uid, password,
+            model, 'search_read',
+            [domain + [('id', '>', last_id)]],
+            options
+        )
+        yield from page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]['id']
+
+
+def read_all(models, db, uid, password, model, domain, fields, page_size=5000, context=None):
+    """search_read every matching record into a list"""
+    return list(iter_all(models, db, uid, password, model, domain, fields, page_size, context))
+
+
 def import_products(url, db, username, password, products_file):
     """Import products to Odoo"""
     print("🚀 Bearings Inc - Product Import")
@@ -39,9 +66,27 @@ def import_products(url, db, username, password, products_file):
     products = data['products']
     print(f"✅ Loaded {len(products)} products")
     
+    # Resolve categories and brands once for the whole catalog
+    print("\n🏷️  Resolving categories and brands...")
+    taxonomy = TaxonomyResolver(models, db, uid, password, url)
+    taxonomy.preload(products)
+    created = sum(taxonomy.created.values())
+    print(f"✅ Taxonomy ready ({created} created)")
+    
+    # Existing products are updated, so re-running the import never duplicates them
+    existing = {
+        p['default_code']: p['id'] for p in models.execute_kw(
+            db, uid, password,
+            'product.template', 'search_read',
+            [[('default_code', 'in', [p['sku'] for p in products])]],
+            {'fields': ['default_code'], 'context': {'active_test': False}}
+        )
+    }
+    
     # Import products
     print("\n📥 Importing products...")
     imported = 0
+    updated = 0
     errors = []
     
     for i, product in enumerate(products, 1):
@@ -56,32 +101,41 @@ def import_products(url, db, username, password, products_file):
                 'description_sale': product['description'],
                 'type': 'product',
                 'website_published': True,
+                **taxonomy.product_values(product),
             }
             
-            # Create product
-            product_id = models.execute_kw(
-                db, uid, password,
-                'product.template', 'create',
-                [product_data]
-            )
-            
-            print(f"   ✅ Created product ID: {product_id}")
+            product_id = existing.get(product['sku'])
+            if product_id:
+                if 'attribute_line_ids' in product_data:
+                    # Replace the brand line instead of adding a second one
+                    product_data['attribute_line_ids'] = [(5, 0, 0)] + product_data['attribute_line_ids']
+                models.execute_kw(
+                    db, uid, password,
+                    'product.template', 'write',
+                    [[product_id], product_data]
+                )
+                updated += 1
+                print(f"   ✅ Updated product ID: {product_id}")
+            else:
+                product_id = models.execute_kw(
+                    db, uid, password,
+                    'product.template', 'create',
+                    [product_data]
+                )
+                print(f"   ✅ Created product ID: {product_id}")
             
             # Upload image if exists
             image_path = Path(product['image_path'])
             if image_path.exists():
-                with open(image_path, 'rb') as img:
-                    image_data = base64.b64encode(img.read()).decode('utf-8')
-                
                 models.execute_kw(
                     db, uid, password,
                     'product.template', 'write',
-                    [[product_id], {'image_1920': image_data}]
+                    [[product_id], {'image_1920': StreamedFile(image_path)}]
                 )
                 print(f"   📷 Image uploaded")
             
             imported += 1
-            
+        
         except Exception as e:
             error_msg = f"{product['name']}: {str(e)}"
             errors.append(error_msg)
@@ -90,7 +144,7 @@ def import_products(url, db, username, password, products_file):
     # Summary
     print("\n" + "=" * 70)
     print("📊 Import Summary:")
-    print(f"   ✅ Successfully imported: {imported}/{len(products)}")
+    print(f"   ✅ Successfully imported: {imported}/{len(products)} ({updated} already existed and were updated)")
     print(f"   ❌ Errors: {len(errors)}")
     
     if errors:
@@ -107,6 +161,9 @@ def import_products(url, db, username, password, products_file):
 
 
 def main():
+    # Imported here: warm_cache itself uses connect_odoo from this module
+    from warm_cache import odoo_now, warm_after_push
+    
     # Configuration
     URL = "http://localhost:8069"
     DB = "bearings"
@@ -115,15 +172,19 @@ def main():
     PRODUCTS_FILE = "data/bearing_products.json"
     
     try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
+        started = odoo_now()
         imported, errors = import_products(URL, DB, USERNAME, PASSWORD, PRODUCTS_FILE)
+        report_rpc_metrics()
         
         if imported > 0:
+            warm_after_push(URL, DB, USERNAME, PASSWORD, since=started)
             print("\n✅ Import completed successfully!")
             exit(0)
         else:
             print("\n❌ Import failed!")
             exit(1)
-            
+    
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
         exit(1)
@@ -38,33 +38,22 @@ docker-compose up -d
 
 # Wait for Odoo to be ready
 echo ""
-echo "⏳ Waiting for Odoo to start (this may take 1-2 minutes)..."
-sleep 30
-
-# Check if Odoo is responding
-MAX_RETRIES=30
-RETRY_COUNT=0
-
-while [ $RETRY_COUNT -lt $MAX_RETRIES ]; do
-    if curl -s http://localhost:8069 > /dev/null; then
-        echo ""
-        echo "✅ Odoo 18 is ready!"
-        echo ""
-        echo "📋 Connection details:"
-        echo "   URL: http://localhost:8069"
-        echo "   Database: (create via script or web UI)"
-        echo "   Master Password: admin"
-        echo ""
-        echo "🔧 Next steps:"
-        echo "   1. Create database: python3 ../scripts/create_database.py"
-        echo "   2. Configure Odoo: python3 ../scripts/configure_bearings_complete.py"
-        exit 0
-    fi
-    
-    RETRY_COUNT=$((RETRY_COUNT + 1))
-    echo "   Still starting... ($RETRY_COUNT/$MAX_RETRIES)"
-    sleep 2
-done
+echo "⏳ Waiting for Odoo to start..."
+
+if python3 ../odoo_ready.py --url http://localhost:8069 --timeout 180 --record startup.jsonl; then
+    echo ""
+    echo "✅ Odoo 18 is ready!"
+    echo ""
+    echo "📋 Connection details:"
+    echo "   URL: http://localhost:8069"
+    echo "   Database: (create via script or web UI)"
+    echo "   Master Password: admin"
+    echo ""
+    echo "🔧 Next steps:"
+    echo "   1. Create database: python3 ../scripts/create_database.py"
+    echo "   2. Configure Odoo: python3 ../scripts/configure_bearings_complete.py"
+    exit 0
+fi
 
 echo ""
 echo "⚠️  Odoo took longer than expected to start"
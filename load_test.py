@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Storefront Load Test - Bearings Inc
+Simulates concurrent shoppers (browse → search → product → add-to-cart → checkout)
+and reports throughput, error rate and latency percentiles per step
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urljoin, urlsplit
+
+from diagnose_website import classify_page, percentile
+from odoo_ready import wait_for_odoo
+
+STEPS = ['browse', 'search', 'product', 'add_to_cart', 'checkout']
+SEARCH_TERMS = ['bearing', 'SKF', 'FAG', 'roller', 'ball', 'thrust', 'NTN', '6205']
+
+CSRF_PATTERN = re.compile(r'name="csrf_token"\s+value="([^"]+)"|csrf_token:\s*"([^"]+)"')
+PRODUCT_LINK_PATTERN = re.compile(r'href="(/shop/[^"?#]+)"')
+PRODUCT_ID_PATTERN = re.compile(r'name="product_id"\s+value="(\d+)"')
+
+
+class ShopperClient:
+    """Minimal keep-alive HTTP/1.1 client for one virtual shopper"""
+    
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.secure = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.secure else 80)
+        self.timeout = timeout
+        self.cookies = {}
+        self.reader = None
+        self.writer = None
+    
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+        self.reader = self.writer = None
+    
+    async def request(self, method, path, form=None, max_redirects=5):
+        """Send a request and return (status, body), following redirects"""
+        status, headers, body = await asyncio.wait_for(
+            self._send(method, path, form), self.timeout
+        )
+        
+        location = headers.get('location')
+        if status in (301, 302, 303, 307, 308) and location and max_redirects > 0:
+            target = urlsplit(urljoin(path, location))
+            next_path = target.path + (f'?{target.query}' if target.query else '')
+            return await self.request('GET', next_path, max_redirects=max_redirects - 1)
+        
+        return status, body
+    
+    async def _send(self, method, path, form):
+        if self.writer is None:
+            context = ssl.create_default_context() if self.secure else None
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port, ssl=context
+            )
+        
+        payload = urlencode(form).encode() if form is not None else b''
+        lines = [
+            f'{method} {path} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            'User-Agent: bearings-loadtest',
+            'Connection: keep-alive',
+        ]
+        if self.cookies:
+            lines.append('Cookie: ' + '; '.join(f'{k}={v}' for k, v in self.cookies.items()))
+        if form is not None:
+            lines.append('Content-Type: application/x-www-form-urlencoded')
+            lines.append(f'Content-Length: {len(payload)}')
+        
+        try:
+            self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + payload)
+            await self.writer.drain()
+            return await self._read_response()
+        except Exception:
+            await self.close()
+            raise
+    
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+        
+        headers = {}
+        while True:
+            line = (await self.reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            key, _, value = line.partition(':')
+            key = key.strip().lower()
+            value = value.strip()
+            if key == 'set-cookie':
+                name, _, rest = value.partition('=')
+                self.cookies[name.strip()] = rest.split(';', 1)[0]
+            headers[key] = value
+        
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            body = await self.reader.read()
+            await self.close()
+        
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        
+        return status, headers, body
+
+
+class LoadTestStats:
+    """Collects per-step samples during a run"""
+    
+    def __init__(self):
+        self.samples = []
+        self.active_users = 0
+        self.started = time.perf_counter()
+        # (seconds since start, active users from then on)
+        self.levels = [(0.0, 0)]
+    
+    def _change_users(self, delta):
+        self.active_users += delta
+        self.levels.append((time.perf_counter() - self.started, self.active_users))
+    
+    def user_joined(self):
+        self._change_users(1)
+    
+    def user_left(self):
+        self._change_users(-1)
+    
+    def time_at_levels(self, duration):
+        """Seconds spent at each number of active users"""
+        seconds = {}
+        ends = [at for at, _ in self.levels[1:]] + [duration]
+        for (at, users), end in zip(self.levels, ends):
+            seconds[users] = seconds.get(users, 0.0) + max(0.0, end - at)
+        return seconds
+    
+    def record(self, step, latency_ms, ok, error=None):
+        self.samples.append({
+            'step': step,
+            'at': round(time.perf_counter() - self.started, 3),
+            'users': self.active_users,
+            'latency_ms': round(latency_ms, 2),
+            'ok': ok,
+            'error': error,
+        })
+    
+    def summarize(self, duration, stages=5):
+        """Aggregate throughput, error rate and percentiles"""
+        def stats(samples, elapsed=duration):
+            latencies = [s['latency_ms'] for s in samples if s['ok']]
+            errors = sum(1 for s in samples if not s['ok'])
+            return {
+                'requests': len(samples),
+                'errors': errors,
+                'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+                'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+            }
+        
+        per_step = {step: stats([s for s in self.samples if s['step'] == step]) for step in STEPS}
+        
+        # Group samples by how many shoppers were active to show where latency degrades.
+        # Ramp-up and ramp-down both pass through the lower levels, so throughput
+        # uses the total time actually spent at each level, not first-to-last sample.
+        peak = max((s['users'] for s in self.samples), default=0)
+        stage_size = max(1, -(-peak // stages))
+        seconds_at = self.time_at_levels(duration)
+        per_concurrency = {}
+        for low in range(0, peak, stage_size):
+            high = low + stage_size
+            bucket = [s for s in self.samples if low < s['users'] <= high]
+            if bucket:
+                elapsed = sum(t for users, t in seconds_at.items() if low < users <= high)
+                per_concurrency[f'{low + 1}-{high}'] = stats(bucket, elapsed)
+        
+        errors = {}
+        for s in self.samples:
+            if s['error']:
+                errors[s['error']] = errors.get(s['error'], 0) + 1
+        
+        return {
+            'duration_s': round(duration, 2),
+            'total': stats(self.samples),
+            'steps': per_step,
+            'concurrency': per_concurrency,
+            'errors': dict(sorted(errors.items(), key=lambda e: -e[1])[:10]),
+        }
+
+
+async def timed_step(stats, step, call):
+    """Run one session step and record its latency"""
+    start = time.perf_counter()
+    try:
+        status, body = await call
+    except Exception as e:
+        stats.record(step, (time.perf_counter() - start) * 1000, False, type(e).__name__)
+        return None
+    
+    latency = (time.perf_counter() - start) * 1000
+    if status >= 400:
+        stats.record(step, latency, False, f'HTTP {status}')
+        return None
+    stats.record(step, latency, True)
+    return body.decode('utf-8', errors='replace')
+
+
+async def shopper_session(client, stats, think_time):
+    """One browse → search → product → add-to-cart → checkout visit"""
+    async def pause():
+        if think_time:
+            await asyncio.sleep(random.uniform(0, think_time))
+    
+    html = await timed_step(stats, 'browse', client.request('GET', '/shop'))
+    if html is None:
+        return
+    await pause()
+    
+    term = random.choice(SEARCH_TERMS)
+    html = await timed_step(stats, 'search', client.request('GET', f'/shop?search={term}')) or html
+    await pause()
+    
+    links = [link for link in PRODUCT_LINK_PATTERN.findall(html) if classify_page(link) == 'product']
+    if not links:
+        stats.record('product', 0, False, 'No product links')
+        return
+    html = await timed_step(stats, 'product', client.request('GET', random.choice(links)))
+    if html is None:
+        return
+    await pause()
+    
+    product_id = PRODUCT_ID_PATTERN.search(html)
+    csrf = CSRF_PATTERN.search(html)
+    form = {'product_id': product_id.group(1) if product_id else '', 'add_qty': 1}
+    if csrf:
+        form['csrf_token'] = csrf.group(1) or csrf.group(2)
+    if await timed_step(stats, 'add_to_cart', client.request('POST', '/shop/cart/update', form)) is None:
+        return
+    await pause()
+    
+    await timed_step(stats, 'checkout', client.request('GET', '/shop/checkout'))
+
+
+async def virtual_user(base_url, stats, start_delay, deadline, think_time):
+    """Run shopper sessions until the deadline"""
+    await asyncio.sleep(start_delay)
+    stats.user_joined()
+    try:
+        while time.perf_counter() < deadline:
+            # Each visit is a fresh shopper with its own cookies and connection
+            client = ShopperClient(base_url)
+            try:
+                await shopper_session(client, stats, think_time)
+            finally:
+                await client.close()
+    finally:
+        stats.user_left()
+
+
+async def run_load_test(base_url, users=10, ramp_up=10.0, duration=30.0, think_time=1.0):
+    """Ramp up virtual users and run sessions for the given duration"""
+    stats = LoadTestStats()
+    deadline = time.perf_counter() + duration
+    
+    tasks = [
+        asyncio.create_task(virtual_user(
+            base_url, stats, ramp_up * i / max(users, 1), deadline, think_time
+        ))
+        for i in range(users)
+    ]
+    await asyncio.gather(*tasks)
+    
+    return stats.summarize(time.perf_counter() - stats.started)
+
+
+class StandInShopHandler(BaseHTTPRequestHandler):
+    """Stand-in for the Odoo storefront routes used by the load test"""
+    
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    products = 50
+    latency = 0.0
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _reply(self, status, body='', headers=None):
+        if self.latency:
+            time.sleep(self.latency)
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        if 'session_id=' not in (self.headers.get('Cookie') or ''):
+            self.send_header('Set-Cookie', f'session_id={random.getrandbits(64):x}; Path=/')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = parts.path
+        
+        if path == '/shop':
+            term = parse_qs(parts.query).get('search', [''])[0]
+            tiles = ''.join(
+                f'<div class="oe_product"><a href="/shop/bearing-{i}">{term} Bearing {i}</a></div>'
+                for i in range(1, self.products + 1)
+            )
+            self._reply(200, f'<html><body>{tiles}</body></html>')
+        elif path.startswith('/shop/bearing-'):
+            product_id = path.rsplit('-', 1)[-1]
+            self._reply(200, (
+                f'<html><body><h1>Bearing {product_id}</h1><form action="/shop/cart/update" method="post">'
+                f'<input type="hidden" name="csrf_token" value="standin"/>'
+                f'<input type="hidden" name="product_id" value="{product_id}"/></form></body></html>'
+            ))
+        elif path in ('/shop/cart', '/shop/checkout'):
+            self._reply(200, '<html><body>Cart</body></html>')
+        else:
+            self._reply(404, 'Not found')
+    
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        
+        if self.path == '/shop/cart/update' and form.get('product_id'):
+            self._reply(303, '', {'Location': '/shop/cart'})
+        else:
+            self._reply(400, 'Bad request')
+
+
+def start_standin_server(port=0, latency=0.0, products=50):
+    """Start the stand-in storefront in a background thread"""
+    handler = type('Handler', (StandInShopHandler,), {'latency': latency, 'products': products})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def print_report(report):
+    """Print the load test summary"""
+    print("\n" + "=" * 70)
+    print(f"📊 Results ({report['duration_s']}s):")
+    total = report['total']
+    print(f"   Requests: {total['requests']} ({total['throughput_rps']} req/s)")
+    print(f"   Error rate: {total['error_rate'] * 100:.2f}%")
+    
+    print("\n⏱️  Latency per step (p50 / p95 / p99 ms):")
+    for step, stats in report['steps'].items():
+        print(f"   {step:<12} {stats['p50_ms']} / {stats['p95_ms']} / {stats['p99_ms']}"
+              f"  ({stats['requests']} req, {stats['error_rate'] * 100:.1f}% errors)")
+    
+    print("\n👥 Latency by active shoppers (p95 ms):")
+    for users, stats in report['concurrency'].items():
+        print(f"   {users:<10} {stats['p95_ms']}  ({stats['throughput_rps']} req/s)")
+    
+    if report['errors']:
+        print("\n⚠️  Errors:")
+        for error, count in report['errors'].items():
+            print(f"   - {error}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default="http://localhost:8069")
+    parser.add_argument('--users', type=int, default=20, help='Peak concurrent shoppers')
+    parser.add_argument('--ramp-up', type=float, default=30.0, help='Seconds to reach peak users')
+    parser.add_argument('--duration', type=float, default=120.0, help='Total test duration in seconds')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Max pause between steps')
+    parser.add_argument('--standin', action='store_true', help='Run against a local stand-in server')
+    parser.add_argument('--standin-latency', type=float, default=0.005)
+    parser.add_argument('--max-error-rate', type=float, help='Exit non-zero above this error rate')
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args()
+    
+    print("🛒 Bearings Inc - Storefront Load Test")
+    print("=" * 70)
+    
+    url = args.url
+    server = None
+    if args.standin:
+        server = start_standin_server(latency=args.standin_latency)
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        print(f"\n🧪 Stand-in storefront at {url}")
+    else:
+        wait_for_odoo(url)
+    
+    print(f"\n🚀 {args.users} shoppers, {args.ramp_up}s ramp-up, {args.duration}s total")
+    report = asyncio.run(run_load_test(url, args.users, args.ramp_up, args.duration, args.think_time))
+    report.update({'url': url, 'users': args.users, 'ramp_up_s': args.ramp_up})
+    
+    if server:
+        server.shutdown()
+    
+    print_report(report)
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\n📁 Report saved to: {args.output}")
+    
+    if not report['total']['requests']:
+        print("\n❌ No requests completed!")
+        exit(1)
+    if args.max_error_rate is not None and report['total']['error_rate'] > args.max_error_rate:
+        print("\n❌ Error rate above threshold!")
+        exit(1)
+    
+    print("\n✅ Load test complete!")
+    exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Catalog Localization - Bearings Inc
+Pushes per-language product names and descriptions to Odoo, one batched
+pass per language, sending only the translations that changed
+"""
+import argparse
+import csv
+import re
+import time
+
+from import_products import connect_odoo, read_all
+from odoo_ready import wait_for_odoo
+from rpc_tracing import report_rpc_metrics
+
+LOAD_BATCH = 1000
+# name_es_ES, description_es_ES, ...
+COLUMN_PATTERN = re.compile(r'^(name|description)_([a-z]{2,3}(?:_[A-Z]{2})?(?:@\w+)?)$')
+FIELDS = {'name': 'name', 'description': 'description_sale'}
+
+
+def read_translations(translations_file):
+    """Return {lang: {sku: {field: value}}} from a CSV with SKU and per-language columns
+    
+    Empty cells are ignored, so a missing translation never clears one in Odoo.
+    """
+    translations = {}
+    with open(translations_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        columns = {}
+        for column in reader.fieldnames or []:
+            match = COLUMN_PATTERN.match(column)
+            if match:
+                columns[column] = (FIELDS[match.group(1)], match.group(2))
+        if not columns:
+            raise Exception("No name_<lang> or description_<lang> columns found")
+        
+        for row in reader:
+            sku = (row.get('SKU') or '').strip()
+            if not sku:
+                continue
+            for column, (field, lang) in columns.items():
+                value = (row.get(column) or '').strip()
+                if value:
+                    translations.setdefault(lang, {}).setdefault(sku, {})[field] = value
+    return translations
+
+
+def ensure_languages(models, db, uid, password, langs, dry_run=False):
+    """Activate languages that are known to Odoo but not installed yet"""
+    records = models.execute_kw(
+        db, uid, password,
+        'res.lang', 'search_read',
+        [[('code', 'in', sorted(langs))]],
+        {'fields': ['code', 'active'], 'context': {'active_test': False}}
+    )
+    found = {r['code']: r for r in records}
+    unknown = sorted(set(langs) - set(found))
+    if unknown:
+        raise Exception(f"Unknown languages: {', '.join(unknown)}")
+    
+    inactive = [r['id'] for r in records if not r['active']]
+    if inactive and not dry_run:
+        print(f"   📥 Installing {len(inactive)} languages...")
+        wizard_id = models.execute_kw(
+            db, uid, password,
+            'base.language.install', 'create',
+            [{'lang_ids': [(6, 0, inactive)], 'overwrite': False}]
+        )
+        models.execute_kw(
+            db, uid, password,
+            'base.language.install', 'lang_install',
+            [[wizard_id]]
+        )
+    return len(inactive)
+
+
+def diff_language(current, wanted):
+    """Group changed products by the set of fields that changed
+    
+    Returns {fields_tuple: [(id, values)]} so each group is one load call.
+    """
+    groups = {}
+    for sku, values in wanted.items():
+        record = current.get(sku)
+        if record is None:
+            continue
+        changed = tuple(f for f in ('name', 'description_sale') if f in values
+                        and values[f] != (record[f] or ''))
+        if changed:
+            groups.setdefault(changed, []).append((record['id'], values))
+    return groups
+
+
+def push_language(models, db, uid, password, lang, wanted, batch_size=LOAD_BATCH, dry_run=False):
+    """Read one language, then load only the changed translations in that language"""
+    context = {'lang': lang}
+    templates = read_all(models, db, uid, password, 'product.template',
+                         [('default_code', '!=', False)],
+                         ['default_code', 'name', 'description_sale'], context=context)
+    current = {t['default_code']: t for t in templates}
+    groups = diff_language(current, wanted)
+    
+    stats = {'lang': lang, 'unknown': len(set(wanted) - set(current)),
+             'changed': sum(len(g) for g in groups.values()), 'calls': 0, 'errors': []}
+    stats['unchanged'] = len(current) - stats['changed']
+    if dry_run:
+        return stats
+    
+    for fields, records in groups.items():
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            result = models.execute_kw(
+                db, uid, password,
+                'product.template', 'load',
+                [['.id', *fields], [[str(record_id), *(values[f] for f in fields)]
+                                    for record_id, values in batch]],
+                {'context': context}
+            )
+            stats['calls'] += 1
+            stats['errors'] += [m['message'] for m in result.get('messages', [])
+                                if m.get('type') == 'error']
+    return stats
+
+
+def localize_catalog(url, db, username, password, translations_file, languages=None,
+                     batch_size=LOAD_BATCH, dry_run=False):
+    """Push product translations, one batched pass per language"""
+    print("🌍 Bearings Inc - Catalog Localization")
+    print("=" * 70)
+    
+    started = time.perf_counter()
+    print("\n🔌 Connecting to Odoo...")
+    uid, models = connect_odoo(url, db, username, password)
+    print(f"✅ Connected as user ID: {uid}")
+    
+    print(f"\n📄 Reading {translations_file}...")
+    translations = read_translations(translations_file)
+    if languages:
+        translations = {lang: t for lang, t in translations.items() if lang in languages}
+    print(f"✅ Languages: {', '.join(f'{lang} ({len(t)} products)' for lang, t in sorted(translations.items()))}")
+    
+    print("\n🔤 Checking languages...")
+    installed = ensure_languages(models, db, uid, password, translations, dry_run)
+    print(f"✅ {installed} installed, {len(translations) - installed} already active")
+    
+    results = []
+    for lang, wanted in sorted(translations.items()):
+        lang_started = time.perf_counter()
+        stats = push_language(models, db, uid, password, lang, wanted, batch_size, dry_run)
+        stats['seconds'] = round(time.perf_counter() - lang_started, 2)
+        results.append(stats)
+        print(f"   ✅ {lang}: {stats['changed']} changed, {stats['unchanged']} unchanged, "
+              f"{stats['calls']} load calls, {stats['seconds']:.1f}s")
+        for error in stats['errors'][:5]:
+            print(f"      ❌ {error}")
+    
+    print("\n" + "=" * 70)
+    print("📊 Localization Summary:" + (" (dry run)" if dry_run else ""))
+    print(f"   Translations changed: {sum(r['changed'] for r in results)}")
+    print(f"   Load calls: {sum(r['calls'] for r in results)}")
+    print(f"   Unknown SKUs: {max((r['unknown'] for r in results), default=0)}")
+    print(f"   Errors: {sum(len(r['errors']) for r in results)}")
+    print(f"   ⏱️  {time.perf_counter() - started:.1f}s")
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('translations_file', help='CSV with SKU, name_<lang> and description_<lang> columns')
+    parser.add_argument('--languages', help='Comma-separated subset of languages to push')
+    parser.add_argument('--batch-size', type=int, default=LOAD_BATCH)
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    args = parser.parse_args()
+    
+    URL = "http://localhost:8069"
+    DB = "bearings"
+    USERNAME = "admin"
+    PASSWORD = "admin"
+    
+    languages = set(args.languages.split(',')) if args.languages else None
+    
+    try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
+        results = localize_catalog(URL, DB, USERNAME, PASSWORD, args.translations_file,
+                                   languages, args.batch_size, args.dry_run)
+        report_rpc_metrics()
+        exit(1 if any(r['errors'] for r in results) else 0)
+    except Exception as e:
+        print(f"\n❌ Fatal error: {str(e)}")
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Odoo Readiness Probe - Bearings Inc
+Waits until Odoo can serve RPC, using exponential backoff with jitter
+"""
+import argparse
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+import xmlrpc.client
+from datetime import datetime, timezone
+
+
+class OdooNotReady(Exception):
+    """Raised when Odoo does not become ready before the timeout"""
+
+
+class TimeoutTransportMixin:
+    """Applies a socket timeout to XML-RPC connections"""
+    
+    def __init__(self, timeout, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = timeout
+    
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class TimeoutTransport(TimeoutTransportMixin, xmlrpc.client.Transport):
+    pass
+
+
+class SafeTimeoutTransport(TimeoutTransportMixin, xmlrpc.client.SafeTransport):
+    pass
+
+
+def _proxy(url, service, timeout):
+    transport_class = SafeTimeoutTransport if url.startswith('https') else TimeoutTransport
+    return xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/{service}', transport=transport_class(timeout))
+
+
+def probe_http(url, db=None, username=None, password=None, timeout=5):
+    """Check that the web server answers"""
+    for path in ('/web/health', '/web/login'):
+        try:
+            with urllib.request.urlopen(f'{url}{path}', timeout=timeout) as response:
+                if response.status < 500:
+                    return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                continue
+            if e.code >= 500:
+                raise
+            return True
+    return False
+
+
+def probe_database(url, db, username=None, password=None, timeout=5):
+    """Check that the database exists (skipped when listing is disabled)"""
+    try:
+        databases = _proxy(url, 'db', timeout).list()
+    except xmlrpc.client.Fault:
+        # list_db = False in the Odoo config; authentication will tell
+        return True
+    return db in databases
+
+
+def probe_auth(url, db, username, password, timeout=5):
+    """Check that the user can authenticate"""
+    return bool(_proxy(url, 'common', timeout).authenticate(db, username, password, {}))
+
+
+def wait_for_odoo(url, db=None, username=None, password=None, timeout=300,
+                  initial_delay=0.5, max_delay=10.0, quiet=False):
+    """Block until Odoo serves HTTP, lists the database and authenticates
+    
+    Probes run in order and each one is retried with exponential backoff and
+    jitter until it passes. Database and authentication probes are skipped
+    when no database or credentials are given. Returns a report with the
+    time at which each probe first passed.
+    """
+    probes = [('http', probe_http)]
+    if db:
+        probes.append(('database', probe_database))
+        if username:
+            probes.append(('auth', probe_auth))
+    
+    started = time.perf_counter()
+    deadline = started + timeout
+    report = {'url': url, 'db': db, 'probes': {}, 'attempts': 0}
+    
+    for name, probe in probes:
+        attempt = 0
+        while True:
+            attempt += 1
+            report['attempts'] += 1
+            try:
+                if probe(url, db, username, password):
+                    break
+                error = 'not ready'
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            
+            delay = min(max_delay, initial_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            if time.perf_counter() + delay > deadline:
+                raise OdooNotReady(f"Odoo not ready after {timeout}s ({name}: {error})")
+            if not quiet:
+                print(f"   ⏳ Waiting for Odoo ({name}: {error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+        
+        report['probes'][name] = {
+            'ready_after': round(time.perf_counter() - started, 2),
+            'attempts': attempt,
+        }
+    
+    report['startup_seconds'] = round(time.perf_counter() - started, 2)
+    report['timestamp'] = datetime.now(timezone.utc).isoformat()
+    
+    if not quiet:
+        print(f"   ✅ Odoo ready in {report['startup_seconds']}s ({report['attempts']} probes)")
+    
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default="http://localhost:8069")
+    parser.add_argument('--db', help='Also wait for this database')
+    parser.add_argument('--username', help='Also wait until this user can authenticate')
+    parser.add_argument('--password', default="admin")
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--record', help='Append the startup report as a JSON line')
+    args = parser.parse_args()
+    
+    print(f"⏳ Waiting for Odoo at {args.url}...")
+    
+    try:
+        report = wait_for_odoo(args.url, args.db, args.username, args.password, args.timeout)
+    except OdooNotReady as e:
+        print(f"\n❌ {str(e)}")
+        exit(1)
+    
+    if args.record:
+        with open(args.record, 'a') as f:
+            f.write(json.dumps(report) + '\n')
+    
+    exit(0)
+
+
+if __name__ == '__main__':
+    main()
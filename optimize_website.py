@@ -10,24 +10,26 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'odoo' / 'odoo-ai-c
 
 from src.orchestrator import Orchestrator
 
+from odoo_ready import wait_for_odoo
 
-def main():
+
+def optimize_website(url, db, username, password):
     """Optimize website"""
     print("🔧 Bearings Inc - Website Optimization")
     print("=" * 70)
     
     # Initialize orchestrator
     orchestrator = Orchestrator(
-        url="http://localhost:8069",
-        db="bearings",
-        username="admin",
-        password="admin"
+        url=url,
+        db=db,
+        username=username,
+        password=password
     )
     
     # Run optimization
     print("\n🤖 Running WebsiteOptimizerAgent...")
     result = orchestrator.configure("optimize website", {
-        'url': 'http://localhost:8069'
+        'url': url
     })
     
     print("\n" + "=" * 70)
@@ -49,6 +51,12 @@ def main():
             print(f"   Fixes applied: {fixes.get('total_fixes', 0)}")
     
     print("\n✅ Optimization complete!")
+    return result
+
+
+def main():
+    wait_for_odoo("http://localhost:8069", "bearings", "admin", "admin")
+    optimize_website("http://localhost:8069", "bearings", "admin", "admin")
 
 
 if __name__ == '__main__':
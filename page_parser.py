@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Storefront Page Parser - Bearings Inc
+Pluggable HTML analysis backends for the diagnose, audit and crawl tooling
+"""
+import argparse
+import functools
+import html as html_lib
+import re
+import time
+from pathlib import Path
+
+# Placeholder text left over from the default Odoo theme
+PLACEHOLDERS = {
+    'hello@mycompany.com': 'Email placeholder',
+    '+1 555-555-5556': 'Phone placeholder',
+    'Lorem ipsum': 'Lorem ipsum text',
+}
+
+PLACEHOLDER_PATTERN = re.compile(
+    '|'.join(re.escape(p) for p in sorted(PLACEHOLDERS, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+PRODUCT_TILE_CLASS = 'oe_product'
+PRODUCT_TITLE_CLASS = 'o_wsale_products_item_title'
+
+BACKENDS = ['selectolax', 'lxml', 'regex', 'bs4']
+
+# Regex backend: pattern scan without building a tree
+HIDDEN_RE = re.compile(r'<(?:(script|style)\b([^>]*)>.*?</\1\s*>|!--.*?-->)', re.I | re.S)
+TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title\s*>', re.I | re.S)
+NON_TEXT_RE = re.compile(r'<(script|style)\b.*?</\1\s*>|<!--.*?-->|<[^>]+>', re.I | re.S)
+TILE_RE = re.compile(r'<\w+\s[^>]*?class=(["\'])[^"\']*\b%s\b' % PRODUCT_TILE_CLASS, re.I)
+TILE_TITLE_RE = re.compile(
+    r'<(\w+)\s[^>]*?class=(["\'])[^"\']*\b%s\b[^>]*>(.*?)</\1\s*>' % PRODUCT_TITLE_CLASS,
+    re.I | re.S
+)
+LINK_RE = re.compile(r'<a\s[^>]*?href=(["\'])(.*?)\1', re.I | re.S)
+IMG_RE = re.compile(r'<img\s[^>]*?src=(["\'])(.*?)\1', re.I | re.S)
+SCRIPT_RE = re.compile(r'<script\s[^>]*?src=(["\'])(.*?)\1', re.I | re.S)
+STYLESHEET_RE = re.compile(r'<link\s([^>]*)>', re.I)
+ATTR_RE = re.compile(r'(\w+)=(["\'])(.*?)\2', re.S)
+
+
+def scan_placeholders(text):
+    """Find placeholder texts in a single case-insensitive pass"""
+    found = {match.group(0).lower() for match in PLACEHOLDER_PATTERN.finditer(text)}
+    return [p for p in PLACEHOLDERS if p.lower() in found]
+
+
+@functools.lru_cache(maxsize=None)
+def available_backends():
+    """List backends whose dependencies are installed"""
+    available = []
+    for backend in BACKENDS:
+        try:
+            if backend == 'selectolax':
+                import selectolax.lexbor  # noqa: F401
+            elif backend == 'lxml':
+                import lxml.html  # noqa: F401
+            elif backend == 'bs4':
+                import bs4  # noqa: F401
+        except ImportError:
+            continue
+        available.append(backend)
+    return tuple(available)
+
+
+def resolve_backend(backend=None):
+    """Pick the requested backend, or the fastest installed one"""
+    if backend and backend != 'auto':
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown parser backend: {backend}")
+        return backend
+    return available_backends()[0]
+
+
+def _page(title, text, tiles, tile_titles, links, assets):
+    return {
+        'title': title.strip() if title else None,
+        'text': text,
+        'product_count': tiles,
+        'product_titles': [t.strip() for t in tile_titles if t.strip()],
+        'links': links,
+        'assets': assets,
+    }
+
+
+def _class_matches(content, class_name, pattern):
+    """Match pattern at the tags around each occurrence of class_name
+    
+    Trying the pattern at every '<' is what makes a regex scan slow; the
+    class name is rare, so find it with str.find and work back to its tag.
+    """
+    matches = []
+    last_start = -1
+    pos = content.find(class_name)
+    while pos != -1:
+        start = content.rfind('<', 0, pos)
+        if start > last_start:
+            match = pattern.match(content, start)
+            if match:
+                matches.append(match)
+                last_start = start
+        pos = content.find(class_name, pos + len(class_name))
+    return matches
+
+
+def _opening_tag(match):
+    return f'<{match.group(1)}{match.group(2)}>' if match.group(1) else ''
+
+
+def _parse_regex(content):
+    # Tiles, titles and links inside inline scripts, styles or comments are
+    # not part of the page, as for the tree backends; script and style keep
+    # their opening tag so script sources are still found
+    markup = HIDDEN_RE.sub(_opening_tag, content)
+    title = TITLE_RE.search(markup)
+    text = html_lib.unescape(NON_TEXT_RE.sub(' ', content))
+    tile_titles = [
+        html_lib.unescape(NON_TEXT_RE.sub('', m.group(3)))
+        for m in _class_matches(markup, PRODUCT_TITLE_CLASS, TILE_TITLE_RE)
+    ]
+    
+    assets = [('image', m.group(2)) for m in IMG_RE.finditer(markup)]
+    assets += [('script', m.group(2)) for m in SCRIPT_RE.finditer(markup)]
+    for m in STYLESHEET_RE.finditer(markup):
+        attrs = {k.lower(): v for k, _, v in ATTR_RE.findall(m.group(1))}
+        if 'stylesheet' in attrs.get('rel', '').split() and attrs.get('href'):
+            assets.append(('stylesheet', attrs['href']))
+    
+    return _page(
+        html_lib.unescape(title.group(1)) if title else None,
+        text,
+        len(_class_matches(markup, PRODUCT_TILE_CLASS, TILE_RE)),
+        tile_titles,
+        [html_lib.unescape(m.group(2)) for m in LINK_RE.finditer(markup)],
+        [(kind, html_lib.unescape(url)) for kind, url in assets],
+    )
+
+
+def _parse_selectolax(content):
+    from selectolax.lexbor import LexborHTMLParser
+    
+    tree = LexborHTMLParser(content)
+    title = tree.css_first('title')
+    
+    assets = [('image', n.attributes.get('src')) for n in tree.css('img[src]')]
+    assets += [('script', n.attributes.get('src')) for n in tree.css('script[src]')]
+    assets += [
+        ('stylesheet', n.attributes.get('href')) for n in tree.css('link[href]')
+        if 'stylesheet' in (n.attributes.get('rel') or '').split()
+    ]
+    for node in tree.css('script, style'):
+        node.decompose()
+    
+    return _page(
+        title.text() if title else None,
+        tree.body.text(separator=' ') if tree.body else '',
+        len(tree.css(f'.{PRODUCT_TILE_CLASS}')),
+        [n.text(separator=' ') for n in tree.css(f'.{PRODUCT_TITLE_CLASS}')],
+        [n.attributes.get('href') for n in tree.css('a[href]')],
+        assets,
+    )
+
+
+def _parse_lxml(content):
+    import lxml.html
+    
+    if not content.strip():
+        return _page(None, '', 0, [], [], [])
+    tree = lxml.html.fromstring(content)
+    
+    def by_class(name):
+        return tree.xpath(f'//*[contains(concat(" ", normalize-space(@class), " "), " {name} ")]')
+    
+    title = tree.find('.//title')
+    for node in tree.xpath('//script[not(@src)] | //style'):
+        node.drop_tree()
+    
+    assets = [('image', src) for src in tree.xpath('//img/@src')]
+    assets += [('script', src) for src in tree.xpath('//script/@src')]
+    assets += [
+        ('stylesheet', n.get('href')) for n in tree.xpath('//link[@href]')
+        if 'stylesheet' in (n.get('rel') or '').split()
+    ]
+    
+    return _page(
+        title.text_content() if title is not None else None,
+        tree.text_content(),
+        len(by_class(PRODUCT_TILE_CLASS)),
+        [n.text_content() for n in by_class(PRODUCT_TITLE_CLASS)],
+        tree.xpath('//a/@href'),
+        assets,
+    )
+
+
+def _parse_bs4(content):
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(content, 'html.parser')
+    title = soup.find('title')
+    
+    assets = [('image', n['src']) for n in soup.find_all('img', src=True)]
+    assets += [('script', n['src']) for n in soup.find_all('script', src=True)]
+    assets += [
+        ('stylesheet', n['href']) for n in soup.find_all('link', href=True)
+        if 'stylesheet' in (n.get('rel') or [])
+    ]
+    
+    return _page(
+        title.text if title else None,
+        soup.get_text(),
+        len(soup.find_all(class_=PRODUCT_TILE_CLASS)),
+        [n.get_text() for n in soup.find_all(class_=PRODUCT_TITLE_CLASS)],
+        [n['href'] for n in soup.find_all('a', href=True)],
+        assets,
+    )
+
+
+PARSERS = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'regex': _parse_regex,
+    'bs4': _parse_bs4,
+}
+
+
+def parse_page(content, backend=None):
+    """Extract title, text, product tiles, links and assets from a page
+    
+    'selectolax' and 'lxml' are C parsers used when installed, 'regex' is a
+    pattern scan that needs no tree and 'bs4' is the full BeautifulSoup
+    parse. By default the fastest installed backend is used.
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    return PARSERS[resolve_backend(backend)](content)
+
+
+def benchmark_backends(files, rounds=3):
+    """Measure pages per second for each installed backend"""
+    pages = [Path(f).read_text(encoding='utf-8', errors='replace') for f in files]
+    results = {}
+    
+    for backend in available_backends():
+        best = None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for page in pages:
+                scan_placeholders(parse_page(page, backend)['text'])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[backend] = round(len(pages) / best, 1) if best else None
+        print(f"   {backend:<12} {results[backend]} pages/s")
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('files', nargs='+', help='Saved HTML pages to benchmark')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+    
+    print("⏱️  Parser backend benchmark")
+    print("=" * 70)
+    benchmark_backends(args.files, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
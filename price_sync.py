@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Price Sync - Bearings Inc
+Streams a supplier price file, diffs it against Odoo and applies only the
+prices that changed, either as list prices or as pricelist items
+"""
+import argparse
+import csv
+import json
+import time
+from datetime import date
+from pathlib import Path
+
+from import_products import connect_odoo, read_all
+from odoo_ready import wait_for_odoo
+from rpc_tracing import report_rpc_metrics
+
+SCHEDULE_FILE = '.price_schedule.json'
+WRITE_BATCH = 1000
+
+
+def parse_file_price(value):
+    """Price from a price file cell, or None when it is blank or not a number"""
+    value = (value or '').replace('$', '').replace(',', '').strip()
+    try:
+        price = float(value)
+    except ValueError:
+        return None
+    return round(price, 2) if price >= 0 else None
+
+
+def parse_effective_date(value):
+    """YYYY-MM-DD from an Effective_Date cell, '' when blank, None when not a date
+    
+    Dates are normalized so they compare correctly as strings and can be
+    written as a pricelist item's date_start.
+    """
+    value = (value or '').strip()
+    if not value:
+        return ''
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        return None
+
+
+def read_price_file(price_file):
+    """Yield (sku, price, effective_date or None) from a price CSV
+    
+    Uses the inventory column names (SKU, Price or Cost) plus an optional
+    Effective_Date column in YYYY-MM-DD format. Rows whose price is blank or
+    unparseable ("N/A", "call for price") or whose date is not a valid date
+    ("11/01/2026") are yielded with a price of None, so they can be rejected
+    instead of written as 0 or applied at the wrong time.
+    """
+    with open(price_file, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            sku = (row.get('SKU') or '').strip()
+            if not sku:
+                continue
+            value = row.get('Price') if (row.get('Price') or '').strip() else row.get('Cost')
+            effective = parse_effective_date(row.get('Effective_Date'))
+            price = parse_file_price(value) if effective is not None else None
+            yield sku, price, effective or None
+
+
+def group_by_price(changes):
+    """{price: [ids]} so each distinct price is a single write"""
+    groups = {}
+    for record_id, price in changes:
+        groups.setdefault(price, []).append(record_id)
+    return groups
+
+
+def write_grouped(models, db, uid, password, model, field, changes, batch_size=WRITE_BATCH):
+    """Write (id, price) pairs with one call per price and batch"""
+    calls = 0
+    for price, ids in group_by_price(changes).items():
+        for start in range(0, len(ids), batch_size):
+            models.execute_kw(
+                db, uid, password,
+                model, 'write',
+                [ids[start:start + batch_size], {field: price}]
+            )
+            calls += 1
+    return calls
+
+
+def load_schedule(path=SCHEDULE_FILE):
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_schedule(schedule, path=SCHEDULE_FILE):
+    Path(path).write_text(json.dumps(schedule, indent=2, sort_keys=True))
+
+
+def sync_list_prices(models, db, uid, password, prices, today, schedule_file=SCHEDULE_FILE,
+                     dry_run=False):
+    """Apply changed list prices now; keep future-dated ones in the schedule"""
+    print("\n📥 Loading current list prices...")
+    started = time.perf_counter()
+    templates = read_all(models, db, uid, password, 'product.template',
+                         [('default_code', '!=', False)], ['default_code', 'list_price'])
+    current = {t['default_code']: (t['id'], round(t['list_price'], 2)) for t in templates}
+    print(f"   ✅ {len(current)} products in {time.perf_counter() - started:.1f}s")
+    
+    # Previously scheduled prices that are now due take part in this run
+    schedule = load_schedule(schedule_file)
+    for effective, entries in list(schedule.items()):
+        if effective <= today:
+            for sku, price in entries.items():
+                prices.setdefault(sku, {}).setdefault(effective, price)
+            del schedule[effective]
+    
+    stats = {'unchanged': 0, 'unknown': 0, 'scheduled': 0}
+    changes = []
+    for sku, by_date in prices.items():
+        if sku not in current:
+            stats['unknown'] += 1
+            continue
+        due = [d for d in by_date if d <= today]
+        for effective in by_date:
+            if effective > today:
+                schedule.setdefault(effective, {})[sku] = by_date[effective]
+                stats['scheduled'] += 1
+        if not due:
+            continue
+        product_id, old_price = current[sku]
+        new_price = by_date[max(due)]
+        if new_price == old_price:
+            stats['unchanged'] += 1
+        else:
+            changes.append((product_id, new_price))
+    
+    stats['changed'] = len(changes)
+    stats['write_calls'] = 0
+    if not dry_run:
+        stats['write_calls'] = write_grouped(models, db, uid, password, 'product.template',
+                                             'list_price', changes)
+        save_schedule(schedule, schedule_file)
+    return stats
+
+
+def sync_pricelist(models, db, uid, password, prices, pricelist_id, dry_run=False):
+    """Upsert fixed-price pricelist items, one per product and start date
+    
+    Odoo applies an item from its date_start, so future-dated prices are
+    loaded right away and take effect on their own.
+    """
+    print("\n📥 Loading products and pricelist items...")
+    started = time.perf_counter()
+    templates = read_all(models, db, uid, password, 'product.template',
+                         [('default_code', '!=', False)], ['default_code'])
+    template_ids = {t['default_code']: t['id'] for t in templates}
+    items = read_all(models, db, uid, password, 'product.pricelist.item', [
+        ('pricelist_id', '=', pricelist_id),
+        ('applied_on', '=', '1_product'),
+        ('compute_price', '=', 'fixed'),
+    ], ['product_tmpl_id', 'fixed_price', 'date_start'])
+    # date_start is a Datetime ('2026-11-01 00:00:00'), the file has dates
+    existing = {
+        (item['product_tmpl_id'][0], (item['date_start'] or '')[:10] or None):
+            (item['id'], round(item['fixed_price'], 2))
+        for item in items if item['product_tmpl_id']
+    }
+    print(f"   ✅ {len(template_ids)} products, {len(existing)} items in "
+          f"{time.perf_counter() - started:.1f}s")
+    
+    stats = {'unchanged': 0, 'unknown': 0, 'scheduled': 0}
+    updates = []
+    creates = []
+    for sku, by_date in prices.items():
+        if sku not in template_ids:
+            stats['unknown'] += 1
+            continue
+        for effective, price in by_date.items():
+            start = effective[:10] or None
+            key = (template_ids[sku], start)
+            if key in existing:
+                item_id, old_price = existing[key]
+                if old_price == price:
+                    stats['unchanged'] += 1
+                else:
+                    updates.append((item_id, price))
+                continue
+            if start:
+                stats['scheduled'] += 1
+            creates.append({
+                'pricelist_id': pricelist_id,
+                'applied_on': '1_product',
+                'product_tmpl_id': template_ids[sku],
+                'compute_price': 'fixed',
+                'fixed_price': price,
+                'date_start': start or False,
+            })
+    
+    stats['changed'] = len(updates) + len(creates)
+    stats['write_calls'] = 0
+    if not dry_run:
+        stats['write_calls'] = write_grouped(models, db, uid, password, 'product.pricelist.item',
+                                             'fixed_price', updates)
+        for start in range(0, len(creates), WRITE_BATCH):
+            models.execute_kw(
+                db, uid, password,
+                'product.pricelist.item', 'create',
+                [creates[start:start + WRITE_BATCH]]
+            )
+            stats['write_calls'] += 1
+    return stats
+
+
+def sync_prices(url, db, username, password, price_file, pricelist_id=None,
+                schedule_file=SCHEDULE_FILE, dry_run=False, today=None):
+    """Sync a supplier price file into Odoo, touching only changed prices"""
+    print("💲 Bearings Inc - Price Sync")
+    print("=" * 70)
+    
+    started = time.perf_counter()
+    today = today or date.today().isoformat()
+    
+    print("\n🔌 Connecting to Odoo...")
+    uid, models = connect_odoo(url, db, username, password)
+    print(f"✅ Connected as user ID: {uid}")
+    
+    print(f"\n📄 Reading {price_file}...")
+    # {sku: {effective_date: price}}, '' is 'effective now'
+    prices = {}
+    rows = 0
+    rejected = 0
+    for sku, price, effective in read_price_file(price_file):
+        if price is None:
+            rejected += 1
+            continue
+        prices.setdefault(sku, {})[effective or ''] = price
+        rows += 1
+    print(f"✅ {rows} rows for {len(prices)} SKUs")
+    if rejected:
+        print(f"⚠️  {rejected} rows rejected (missing or unparseable price or effective date)")
+    
+    if pricelist_id:
+        stats = sync_pricelist(models, db, uid, password, prices, pricelist_id, dry_run)
+    else:
+        stats = sync_list_prices(models, db, uid, password, prices, today, schedule_file, dry_run)
+    stats['rejected'] = rejected
+    
+    print("\n" + "=" * 70)
+    print("📊 Price Sync Summary:" + (" (dry run)" if dry_run else ""))
+    print(f"   Changed: {stats['changed']} ({stats['write_calls']} write calls)")
+    print(f"   Unchanged: {stats['unchanged']}")
+    print(f"   Scheduled for later: {stats['scheduled']}")
+    print(f"   Unknown SKUs: {stats['unknown']}")
+    print(f"   Rejected rows: {stats['rejected']}")
+    print(f"   ⏱️  {time.perf_counter() - started:.1f}s")
+    
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('price_file', help='CSV with SKU, Price and optional Effective_Date')
+    parser.add_argument('--pricelist', type=int, help='Load into this pricelist instead of list_price')
+    parser.add_argument('--schedule', default=SCHEDULE_FILE, help='Pending future list prices')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    args = parser.parse_args()
+    
+    URL = "http://localhost:8069"
+    DB = "bearings"
+    USERNAME = "admin"
+    PASSWORD = "admin"
+    
+    try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
+        sync_prices(URL, DB, USERNAME, PASSWORD, args.price_file, args.pricelist,
+                    args.schedule, args.dry_run)
+        report_rpc_metrics()
+        exit(0)
+    except Exception as e:
+        print(f"\n❌ Fatal error: {str(e)}")
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+RPC Tracing - Bearings Inc
+Records every Odoo XML-RPC call (model, method, records, bytes, latency, retries)
+"""
+import json
+import os
+import statistics
+import threading
+import time
+import xmlrpc.client
+from http.client import RemoteDisconnected
+
+from session_daemon import route_url
+from streaming_upload import SafeStreamingTransport, StreamingServerProxy, StreamingTransport
+
+# Methods that are safe to retry after a transient failure
+READ_METHODS = {'search', 'read', 'search_read', 'search_count', 'fields_get',
+                'name_search', 'read_group', 'authenticate', 'version'}
+TRANSIENT_STATUS = {502, 503, 504}
+
+
+class CountingResponse:
+    """Wraps an HTTP response to count the bytes read from it"""
+    
+    def __init__(self, response):
+        self._response = response
+        self.bytes = 0
+    
+    def read(self, *args):
+        data = self._response.read(*args)
+        self.bytes += len(data)
+        return data
+    
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+class CountingTransportMixin:
+    """Records request and response body sizes of the last call"""
+    
+    def send_content(self, connection, request_body):
+        self.last_request_bytes = len(request_body)
+        super().send_content(connection, request_body)
+    
+    def parse_response(self, response):
+        counted = CountingResponse(response)
+        try:
+            return super().parse_response(counted)
+        finally:
+            self.last_response_bytes = counted.bytes
+
+
+class CountingTransport(CountingTransportMixin, StreamingTransport):
+    pass
+
+
+class SafeCountingTransport(CountingTransportMixin, SafeStreamingTransport):
+    pass
+
+
+class RpcTracer:
+    """Collects RPC call records and aggregates them per model and method"""
+    
+    def __init__(self):
+        self.calls = []
+        self.started = time.time()
+        self._lock = threading.Lock()
+    
+    def reset(self):
+        """Start a new run"""
+        with self._lock:
+            self.calls = []
+            self.started = time.time()
+    
+    def record(self, model, method, records=0, request_bytes=0, response_bytes=0,
+               latency_ms=0.0, retries=0, error=None):
+        with self._lock:
+            self.calls.append({
+                'model': model,
+                'method': method,
+                'records': records,
+                'request_bytes': request_bytes,
+                'response_bytes': response_bytes,
+                'latency_ms': round(latency_ms, 2),
+                'retries': retries,
+                'error': error,
+            })
+    
+    def summary(self):
+        """Aggregate calls per (model, method), slowest total first"""
+        groups = {}
+        for call in self.calls:
+            groups.setdefault((call['model'], call['method']), []).append(call)
+        
+        rows = []
+        for (model, method), calls in groups.items():
+            latencies = sorted(c['latency_ms'] for c in calls)
+            if len(latencies) > 1:
+                cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+                p50, p95 = cuts[49], cuts[94]
+            else:
+                p50 = p95 = latencies[0]
+            rows.append({
+                'model': model,
+                'method': method,
+                'calls': len(calls),
+                'records': sum(c['records'] for c in calls),
+                'request_bytes': sum(c['request_bytes'] for c in calls),
+                'response_bytes': sum(c['response_bytes'] for c in calls),
+                'total_ms': round(sum(latencies), 2),
+                'p50_ms': round(p50, 2),
+                'p95_ms': round(p95, 2),
+                'retries': sum(c['retries'] for c in calls),
+                'errors': sum(1 for c in calls if c['error']),
+            })
+        
+        return sorted(rows, key=lambda r: -r['total_ms'])
+    
+    def print_summary(self, limit=10):
+        """Print the per-run RPC summary"""
+        rows = self.summary()
+        if not rows:
+            return
+        
+        total_ms = sum(r['total_ms'] for r in rows)
+        total_calls = sum(r['calls'] for r in rows)
+        sent = sum(r['request_bytes'] for r in rows)
+        received = sum(r['response_bytes'] for r in rows)
+        
+        print("\n📡 RPC Summary:")
+        print(f"   {total_calls} calls, {total_ms / 1000:.2f}s in RPC, "
+              f"{sent // 1024} KB sent, {received // 1024} KB received")
+        for row in rows[:limit]:
+            print(f"   {row['model']}.{row['method']}: {row['calls']} calls, "
+                  f"{row['records']} records, {row['total_ms']:.0f} ms total, "
+                  f"p95 {row['p95_ms']:.0f} ms"
+                  + (f", {row['retries']} retries" if row['retries'] else '')
+                  + (f", {row['errors']} errors" if row['errors'] else ''))
+        if len(rows) > limit:
+            print(f"   ... and {len(rows) - limit} more")
+    
+    def export_jsonl(self, path):
+        """Append every call as a JSON line"""
+        with open(path, 'a') as f:
+            for call in self.calls:
+                f.write(json.dumps({'run_started': self.started, **call}) + '\n')
+    
+    def export_openmetrics(self, path):
+        """Write the aggregated summary in OpenMetrics text format"""
+        metrics = [
+            ('bearings_rpc_calls', 'counter', 'calls', 'RPC calls'),
+            ('bearings_rpc_records', 'counter', 'records', 'Records touched by RPC calls'),
+            ('bearings_rpc_request_bytes', 'counter', 'request_bytes', 'RPC request body bytes'),
+            ('bearings_rpc_response_bytes', 'counter', 'response_bytes', 'RPC response body bytes'),
+            ('bearings_rpc_retries', 'counter', 'retries', 'RPC retries'),
+            ('bearings_rpc_errors', 'counter', 'errors', 'Failed RPC calls'),
+            ('bearings_rpc_latency_seconds', 'counter', 'total_ms', 'Time spent in RPC calls'),
+        ]
+        rows = self.summary()
+        lines = []
+        for name, kind, field, help_text in metrics:
+            lines.append(f'# TYPE {name} {kind}')
+            lines.append(f'# HELP {name} {help_text}')
+            for row in rows:
+                value = row[field] / 1000 if field == 'total_ms' else row[field]
+                lines.append(f'{name}_total{{model="{row["model"]}",method="{row["method"]}"}} {value}')
+        lines.append('# EOF')
+        
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+class TracedProxy:
+    """ServerProxy wrapper that records every call on a tracer"""
+    
+    def __init__(self, url, tracer, max_retries=2, backoff=0.5):
+        transport = SafeCountingTransport() if url.startswith('https') else CountingTransport()
+        self._proxy = StreamingServerProxy(url, transport=transport)
+        self._transport = transport
+        self._service = url.rstrip('/').rsplit('/', 1)[-1]
+        self._tracer = tracer
+        self._max_retries = max_retries
+        self._backoff = backoff
+    
+    def __getattr__(self, name):
+        def call(*args):
+            return self._call(name, args)
+        return call
+    
+    def _call(self, name, args):
+        if name == 'execute_kw':
+            model, method = args[3], args[4]
+        else:
+            model, method = self._service, name
+        
+        retries = 0
+        start = time.perf_counter()
+        while True:
+            self._transport.last_request_bytes = 0
+            self._transport.last_response_bytes = 0
+            try:
+                result = getattr(self._proxy, name)(*args)
+                error = None
+                break
+            except (ConnectionError, RemoteDisconnected, xmlrpc.client.ProtocolError) as e:
+                transient = not isinstance(e, xmlrpc.client.ProtocolError) or e.errcode in TRANSIENT_STATUS
+                if transient and method in READ_METHODS and retries < self._max_retries:
+                    retries += 1
+                    time.sleep(self._backoff * 2 ** (retries - 1))
+                    continue
+                error = e
+                break
+            except Exception as e:
+                error = e
+                break
+        
+        self._tracer.record(
+            model, method,
+            records=_count_records(method, args, None if error else result),
+            request_bytes=self._transport.last_request_bytes,
+            response_bytes=self._transport.last_response_bytes,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            retries=retries,
+            error=type(error).__name__ if error else None,
+        )
+        if error:
+            raise error
+        return result
+
+
+def _count_records(method, args, result):
+    """Best-effort number of records a call touched"""
+    if isinstance(result, list):
+        return len(result)
+    if method in ('write', 'unlink') and len(args) > 5 and args[5]:
+        return len(args[5][0]) if isinstance(args[5][0], list) else 1
+    if method == 'create' and result:
+        return 1
+    return 0
+
+
+# Shared tracer for the current run
+tracer = RpcTracer()
+
+
+def tracing_enabled():
+    return os.environ.get('BEARINGS_TRACE', '1') not in ('0', 'false', 'no')
+
+
+def traced_proxy(url):
+    """ServerProxy for url, traced unless BEARINGS_TRACE=0
+    
+    Calls go through the session daemon when BEARINGS_DAEMON is set.
+    """
+    url = route_url(url)
+    if tracing_enabled():
+        return TracedProxy(url, tracer)
+    return StreamingServerProxy(url)
+
+
+def report_rpc_metrics():
+    """Print the run summary and export it if BEARINGS_METRICS_FILE is set
+    
+    Files ending in .jsonl get one line per call; any other file gets the
+    aggregated summary in OpenMetrics text format.
+    """
+    if not tracing_enabled():
+        return
+    
+    tracer.print_summary()
+    
+    path = os.environ.get('BEARINGS_METRICS_FILE')
+    if path:
+        if path.endswith('.jsonl'):
+            tracer.export_jsonl(path)
+        else:
+            tracer.export_openmetrics(path)
+        print(f"   📁 RPC metrics written to {path}")
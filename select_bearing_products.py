@@ -9,13 +9,16 @@ import random
 from pathlib import Path
 
 
-def select_products(inventory_file, output_file, limit=20):
+BASE_DIR = Path("/Users/lucasnapoli/Desktop/projects/TradingAgents-main")
+
+
+def select_products(inventory_file, output_file, limit=20, base_dir=BASE_DIR):
     """Select products with images and descriptions"""
     print(f"🔍 Selecting {limit} bearing products...")
     print("=" * 70)
     
     products = []
-    base_dir = Path("/Users/lucasnapoli/Desktop/projects/TradingAgents-main")
+    base_dir = Path(base_dir)
     
     with open(inventory_file, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Session Daemon - Bearings Inc
+Local XML-RPC proxy that keeps authenticated sessions, pooled keep-alive
+connections and metadata caches warm between short-lived script runs
+"""
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import queue
+import signal
+import threading
+import time
+import xmlrpc.client
+from socketserver import ThreadingMixIn
+from urllib.parse import quote, unquote, urlsplit
+from urllib.request import urlopen
+from xmlrpc.client import Fault
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+DEFAULT_PORT = 8170
+PID_FILE = '.bearings_daemon.pid'
+CACHE_TTL = 600
+POOL_SIZE = 8
+DEFAULT_UPSTREAMS = ['http://localhost:8069']
+# Larger requests (uploads) are piped through unparsed, chunk by chunk
+PASSTHROUGH_BYTES = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Read-only calls whose answers only change with the database schema. Not
+# get_param: database.uuid must be fresh to notice a recreated database.
+CACHED_METHODS = {'fields_get'}
+
+
+def daemon_address():
+    """Daemon URL from BEARINGS_DAEMON, or None to talk to Odoo directly"""
+    return os.environ.get('BEARINGS_DAEMON') or None
+
+
+def route_url(url):
+    """Rewrite an Odoo XML-RPC endpoint to go through the daemon when enabled
+    
+    http://odoo:8069/xmlrpc/2/object becomes
+    <daemon>/upstream/http%3A%2F%2Fodoo%3A8069/xmlrpc/2/object
+    """
+    daemon = daemon_address()
+    if not daemon or '/xmlrpc/2/' not in url:
+        return url
+    base, service = url.split('/xmlrpc/2/', 1)
+    return f"{daemon.rstrip('/')}/upstream/{quote(base, safe='')}/xmlrpc/2/{service}"
+
+
+class UpstreamPool:
+    """Keep-alive ServerProxy objects for one Odoo endpoint"""
+    
+    def __init__(self, url, size=POOL_SIZE):
+        self.url = url
+        self.proxies = queue.LifoQueue()
+        self.created = 0
+        self.size = size
+        self.lock = threading.Lock()
+    
+    def call(self, method, params):
+        try:
+            proxy = self.proxies.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                self.created += 1
+            proxy = xmlrpc.client.ServerProxy(self.url, allow_none=True)
+        try:
+            return getattr(proxy, method)(*params)
+        except Fault:
+            raise
+        except Exception:
+            # Drop the proxy, its connection may be half-closed
+            proxy = None
+            raise
+        finally:
+            if proxy is not None and self.proxies.qsize() < self.size:
+                self.proxies.put(proxy)
+
+
+class SessionDaemon:
+    """Forwards calls to the configured upstreams, answering auth and metadata from cache"""
+    
+    def __init__(self, ttl=CACHE_TTL, pool_size=POOL_SIZE, upstreams=DEFAULT_UPSTREAMS):
+        self.ttl = ttl
+        self.pool_size = pool_size
+        self.upstreams = {u.rstrip('/') for u in upstreams}
+        self.pools = {}
+        self.auth = {}
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.stats = {'calls': 0, 'auth_hits': 0, 'auth_misses': 0,
+                      'cache_hits': 0, 'cache_misses': 0, 'passthrough': 0, 'errors': 0}
+    
+    def check_upstream(self, base):
+        """Refuse anything but the configured Odoo URLs, so this is no open proxy"""
+        if base.rstrip('/') not in self.upstreams:
+            raise Fault(403, f"Upstream not allowed: {base} (start the daemon with --upstream {base})")
+    
+    def pool(self, url):
+        with self.lock:
+            if url not in self.pools:
+                self.pools[url] = UpstreamPool(url, self.pool_size)
+            return self.pools[url]
+    
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+    
+    def dispatch(self, base, service, method, params):
+        self.check_upstream(base)
+        self._count('calls')
+        url = f'{base}/xmlrpc/2/{service}'
+        
+        if service == 'common' and method == 'authenticate':
+            return self._authenticate(url, params)
+        
+        key = None
+        if service == 'object' and method == 'execute_kw' and params[4] in CACHED_METHODS:
+            key = (base, params[0], params[1], _digest(params[2]), json.dumps(params[3:], sort_keys=True))
+        elif service == 'common' and method == 'version':
+            key = (base, 'version')
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached and time.monotonic() - cached[1] < self.ttl:
+                self._count('cache_hits')
+                return cached[0]
+            self._count('cache_misses')
+        
+        try:
+            result = self.pool(url).call(method, params)
+        except Exception:
+            self._count('errors')
+            raise
+        if key is not None:
+            self.cache[key] = (result, time.monotonic())
+        return result
+    
+    def _authenticate(self, url, params):
+        db, login, password = params[:3]
+        key = (url, db, login, _digest(password))
+        cached = self.auth.get(key)
+        if cached and time.monotonic() - cached[1] < self.ttl:
+            self._count('auth_hits')
+            return cached[0]
+        
+        self._count('auth_misses')
+        uid = self.pool(url).call('authenticate', params)
+        if uid:
+            self.auth[key] = (uid, time.monotonic())
+        return uid
+    
+    def status(self):
+        return {
+            'uptime_seconds': round(time.time() - self.started),
+            'pid': os.getpid(),
+            **self.stats,
+            'sessions': len(self.auth),
+            'cached_results': len(self.cache),
+            'allowed_upstreams': sorted(self.upstreams),
+            'upstreams': {url: {'connections': pool.created, 'idle': pool.proxies.qsize()}
+                          for url, pool in self.pools.items()},
+        }
+
+
+def _digest(password):
+    return hashlib.sha256(str(password).encode()).hexdigest()
+
+
+class DaemonRequestHandler(SimpleXMLRPCRequestHandler):
+    def is_rpc_path_valid(self):
+        return self.path.startswith('/upstream/') and '/xmlrpc/2/' in self.path
+    
+    def _upstream(self):
+        prefix, service = self.path.split('/xmlrpc/2/', 1)
+        return unquote(prefix[len('/upstream/'):]), service.strip('/')
+    
+    def _dispatch(self, method, params):
+        base, service = self._upstream()
+        return self.server.daemon.dispatch(base, service, method, params)
+    
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if self.is_rpc_path_valid() and length > PASSTHROUGH_BYTES:
+            return self._pass_through(length)
+        return super().do_POST()
+    
+    def _pass_through(self, length):
+        """Pipe a large request to Odoo and the answer back without parsing either
+        
+        Keeps uploads streamed by the client (StreamedFile) bounded in memory
+        here too. Such calls are never logins or cached metadata.
+        """
+        daemon = self.server.daemon
+        base, service = self._upstream()
+        if base.rstrip('/') not in daemon.upstreams:
+            self.send_error(403, f"Upstream not allowed: {base}")
+            return
+        daemon._count('calls')
+        daemon._count('passthrough')
+        
+        target = urlsplit(base)
+        connection_class = http.client.HTTPSConnection if target.scheme == 'https' else http.client.HTTPConnection
+        upstream = connection_class(target.netloc, timeout=300)
+        responded = False
+        try:
+            upstream.putrequest('POST', f"{target.path.rstrip('/')}/xmlrpc/2/{service}")
+            for header in ('Content-Type', 'Content-Encoding', 'Accept-Encoding', 'User-Agent'):
+                if self.headers.get(header):
+                    upstream.putheader(header, self.headers[header])
+            upstream.putheader('Content-Length', str(length))
+            upstream.endheaders()
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ConnectionError("Client closed the request early")
+                upstream.send(chunk)
+                remaining -= len(chunk)
+            
+            response = upstream.getresponse()
+            responded = True
+            self.send_response(response.status)
+            for header in ('Content-Type', 'Content-Encoding', 'Content-Length'):
+                if response.getheader(header):
+                    self.send_header(header, response.getheader(header))
+            if not response.getheader('Content-Length'):
+                self.close_connection = True
+            self.end_headers()
+            while chunk := response.read(CHUNK_SIZE):
+                self.wfile.write(chunk)
+        except Exception as e:
+            daemon._count('errors')
+            if responded:
+                self.close_connection = True
+            else:
+                self.send_error(502, f"Upstream error: {e}")
+        finally:
+            upstream.close()
+    
+    def do_GET(self):
+        if self.path == '/status':
+            body = json.dumps(self.server.daemon.status()).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+        else:
+            body = b'Not found'
+            self.send_response(404)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class DaemonServer(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+    
+    def __init__(self, daemon, port=DEFAULT_PORT):
+        super().__init__(('127.0.0.1', port), DaemonRequestHandler,
+                         logRequests=False, allow_none=True)
+        self.daemon = daemon
+
+
+def read_status(address, timeout=2):
+    """Status of a running daemon, or None when it does not answer"""
+    try:
+        with urlopen(f"{address.rstrip('/')}/status", timeout=timeout) as response:
+            return json.loads(response.read())
+    except Exception:
+        return None
+
+
+def serve(port=DEFAULT_PORT, ttl=CACHE_TTL, pool_size=POOL_SIZE, pid_file=PID_FILE,
+          upstreams=DEFAULT_UPSTREAMS):
+    """Run the daemon in the foreground until interrupted"""
+    server = DaemonServer(SessionDaemon(ttl, pool_size, upstreams), port)
+    with open(pid_file, 'w') as f:
+        f.write(str(os.getpid()))
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    
+    print(f"🛰️  Session daemon on http://127.0.0.1:{port} for {', '.join(sorted(server.daemon.upstreams))}")
+    print(f"   export BEARINGS_DAEMON=http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(pid_file):
+            os.remove(pid_file)
+    print(f"\n✅ Stopped after {server.daemon.stats['calls']} calls")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--ttl', type=int, default=CACHE_TTL,
+                        help='Seconds logins and cached metadata stay valid')
+    parser.add_argument('--pool-size', type=int, default=POOL_SIZE, help='Idle connections kept per endpoint')
+    parser.add_argument('--pid-file', default=PID_FILE)
+    parser.add_argument('--upstream', action='append', dest='upstreams',
+                        help=f"Odoo URL the daemon may forward to, repeatable (default: {DEFAULT_UPSTREAMS[0]})")
+    args = parser.parse_args()
+    
+    serve(args.port, args.ttl, args.pool_size, args.pid_file, args.upstreams or DEFAULT_UPSTREAMS)
+
+
+if __name__ == '__main__':
+    main()
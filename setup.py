@@ -5,11 +5,105 @@ Complete setup for Bearings Inc
 """
 import json
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from configure_website import configure_website
+from fix_website import fix_website
+from import_products import connect_odoo, import_products
+from odoo_ready import wait_for_odoo
+from taxonomy import TaxonomyResolver
 
-from src.orchestrator import Orchestrator
+URL = "http://localhost:8069"
+DB = "bearings"
+USERNAME = "admin"
+PASSWORD = "admin"
+
+
+def create_categories(url, db, username, password, categories):
+    """Create missing website and internal categories in one batch each"""
+    uid, models = connect_odoo(url, db, username, password)
+    
+    names = [c['name'] for c in categories]
+    taxonomy = TaxonomyResolver(models, db, uid, password, url)
+    taxonomy.public_categories(names)
+    taxonomy.categories(names)
+    
+    created = taxonomy.created['public_categories']
+    print(f"   ✅ Categories: {created} created, {len(names) - created} existing")
+    return created
+
+
+def checked(result):
+    """Raise when a step returns nothing or reports an error, so dependent steps are skipped"""
+    details = result if isinstance(result, dict) else {}
+    status = details.get('status')
+    if not result or status in ('error', 'failed'):
+        raise Exception(f"Step failed: {details.get('error') or status or 'no result'}")
+    return result
+
+
+def import_catalog(url, db, username, password, products_file):
+    """import_products as a pipeline step: fails when nothing was imported"""
+    imported, errors = import_products(url, db, username, password, products_file)
+    if not imported:
+        raise Exception(f"No products imported ({errors[0] if errors else 'empty products file'})")
+    return imported, errors
+
+
+def run_pipeline(steps, max_workers=4):
+    """Run setup steps as a dependency graph
+    
+    steps maps a step name to (dependencies, callable). Each step starts as
+    soon as all of its dependencies have finished. Steps whose dependencies
+    failed are skipped. Returns per-step timing and status.
+    """
+    started = time.perf_counter()
+    results = {}
+    pending = dict(steps)
+    running = {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            # Skip steps that can no longer run
+            for name, (deps, _) in list(pending.items()):
+                failed = [d for d in deps if results.get(d, {}).get('status') in ('failed', 'skipped')]
+                if failed:
+                    results[name] = {'status': 'skipped', 'reason': f"{', '.join(failed)} did not complete"}
+                    del pending[name]
+            
+            # Start every step whose dependencies are done
+            for name, (deps, func) in list(pending.items()):
+                if all(results.get(d, {}).get('status') == 'done' for d in deps):
+                    print(f"\n▶️  {name}")
+                    running[executor.submit(func)] = (name, time.perf_counter())
+                    del pending[name]
+            
+            if not running:
+                break
+            
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, step_started = running.pop(future)
+                now = time.perf_counter()
+                result = {
+                    'start': round(step_started - started, 2),
+                    'duration': round(now - step_started, 2),
+                }
+                try:
+                    result['result'] = future.result()
+                    result['status'] = 'done'
+                except Exception as e:
+                    result['status'] = 'failed'
+                    result['reason'] = str(e)
+                    print(f"\n❌ {name} failed: {str(e)}")
+                results[name] = result
+    
+    for name in pending:
+        results[name] = {'status': 'skipped', 'reason': 'Unresolvable dependencies'}
+    
+    return results, round(time.perf_counter() - started, 2)
 
 
 def main():
@@ -17,65 +111,101 @@ def main():
     print("🚀 Setting up Bearings Inc Website")
     print("=" * 70)
     
-    # Initialize orchestrator
+    # Wait until Odoo can serve RPC
+    print("\n⏳ Checking Odoo...")
+    readiness = wait_for_odoo(URL, DB, USERNAME, PASSWORD)
+    
+    # Initialize orchestrator (imported here so other scripts can reuse the steps above)
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from src.orchestrator import Orchestrator
+    
     orchestrator = Orchestrator(
-        url="http://localhost:8069",
-        db="bearings",
-        username="admin",
-        password="admin"
+        url=URL,
+        db=DB,
+        username=USERNAME,
+        password=PASSWORD
     )
     
-    # Step 1: Install required modules
-    print("\n📦 Installing required modules...")
     modules_to_install = [
         'stock',           # Inventory
         'website',         # Website
         'website_sale'     # eCommerce
     ]
     
-    for module in modules_to_install:
-        print(f"   Installing {module}...")
-        result = orchestrator.configure(f"Install {module} module", {
-            'modules': [module]
-        })
-        print(f"   ✅ {module} installed")
+    categories = [
+        {'name': 'Ball Bearings', 'parent_id': False},
+        {'name': 'Roller Bearings', 'parent_id': False},
+        {'name': 'Thrust Bearings', 'parent_id': False},
+        {'name': 'Special Bearings', 'parent_id': False}
+    ]
     
-    # Step 2: Load products
-    print("\n📦 Loading 20 bearing products...")
     products_file = Path(__file__).parent.parent / "data" / "bearing_products.json"
     
     with open(products_file, 'r', encoding='utf-8') as f:
         product_data = json.load(f)
     
-    print(f"   Products: {product_data['total']}")
+    print(f"\n📦 Products: {product_data['total']}")
     print(f"   Brands: {', '.join(product_data['brands'])}")
     
-    # Step 3: Configure website
-    print("\n🎨 Configuring website...")
-    result = orchestrator.configure("Configure website", {
-        'action': 'full_setup',
-        'theme': {
-            'primary_color': '#0d1b2a',
-            'accent_color': '#3498db',
-            'font_family': 'sans-serif',
-            'layout': 'grid_4_columns'
-        },
-        'categories': [
-            {'name': 'Ball Bearings', 'parent_id': False},
-            {'name': 'Roller Bearings', 'parent_id': False},
-            {'name': 'Thrust Bearings', 'parent_id': False},
-            {'name': 'Special Bearings', 'parent_id': False}
-        ],
-        'products': product_data['products']
-    })
+    def install_modules():
+        # One call so the registry is reloaded once for all modules
+        print(f"   Installing {', '.join(modules_to_install)}...")
+        return checked(orchestrator.configure("Install modules", {
+            'modules': modules_to_install
+        }))
+    
+    def configure_theme():
+        return checked(orchestrator.configure("Configure website", {
+            'action': 'full_setup',
+            'theme': {
+                'primary_color': '#0d1b2a',
+                'accent_color': '#3498db',
+                'font_family': 'sans-serif',
+                'layout': 'grid_4_columns'
+            }
+        }))
+    
+    steps = {
+        'install_modules': ([], install_modules),
+        'upload_assets': (['install_modules'],
+                          lambda: checked(configure_website(URL, DB, USERNAME, PASSWORD))),
+        'create_categories': (['install_modules'],
+                              lambda: create_categories(URL, DB, USERNAME, PASSWORD, categories)),
+        # Products link to categories resolved (and cached) by the previous step
+        'import_products': (['create_categories'],
+                            lambda: import_catalog(URL, DB, USERNAME, PASSWORD, products_file)),
+        'configure_theme': (['install_modules'], configure_theme),
+        'fix_views': (['upload_assets', 'import_products', 'configure_theme'],
+                      lambda: checked(fix_website(URL, DB, USERNAME, PASSWORD))),
+    }
+    
+    results, total = run_pipeline(steps)
+    
+    print("\n" + "=" * 70)
+    print("⏱️  Step timings:")
+    for name in steps:
+        result = results[name]
+        if result['status'] == 'skipped':
+            print(f"   ⏭️  {name:<18} skipped ({result['reason']})")
+        else:
+            icon = '✅' if result['status'] == 'done' else '❌'
+            print(f"   {icon} {name:<18} {result['duration']:>7.2f}s (started at {result['start']:.2f}s)")
+    
+    step_time = sum(r.get('duration', 0) for r in results.values())
+    print(f"   Total: {total:.2f}s wall clock ({step_time:.2f}s of step time)")
+    print(f"   Odoo startup wait: {readiness['startup_seconds']:.2f}s")
+    
+    if any(r['status'] != 'done' for r in results.values()):
+        print("\n❌ Setup incomplete!")
+        exit(1)
     
     print("\n" + "=" * 70)
     print("✅ Setup Complete!")
     print("\n🔗 Access your website:")
-    print("   URL: http://localhost:8069")
-    print("   Database: bearings")
-    print("   Username: admin")
-    print("   Password: admin")
+    print(f"   URL: {URL}")
+    print(f"   Database: {DB}")
+    print(f"   Username: {USERNAME}")
+    print(f"   Password: {PASSWORD}")
     print("\n📊 Summary:")
     print(f"   Modules installed: {len(modules_to_install)}")
     print(f"   Products loaded: {product_data['total']}")
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Database Snapshots - Bearings Inc
+Capture a fully configured database and provision new ones by cloning it
+"""
+import argparse
+import hashlib
+import json
+import shlex
+import shutil
+import subprocess
+import tempfile
+import time
+import xmlrpc.client
+from datetime import datetime, timezone
+from pathlib import Path
+
+from configure_website import SITE_IMAGES, upload_image
+from import_products import connect_odoo, import_products
+from odoo_ready import wait_for_odoo
+from streaming_upload import StreamedFile
+from taxonomy import TaxonomyResolver
+
+SNAPSHOT_DIR = Path('snapshots')
+PRODUCTS_FILE = Path('data/bearing_products.json')
+IMAGES_DIR = Path('assets/images')
+
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(products_file=PRODUCTS_FILE, images_dir=IMAGES_DIR):
+    """Hash every input the setup loads, per product, product photo and image"""
+    with open(products_file, 'r', encoding='utf-8') as f:
+        products = json.load(f)['products']
+    
+    return {
+        'products': {
+            p['sku']: hashlib.sha256(json.dumps(p, sort_keys=True).encode()).hexdigest()
+            for p in products
+        },
+        'photos': {
+            p['sku']: file_hash(p['image_path'])
+            for p in products if p.get('image_path') and Path(p['image_path']).exists()
+        },
+        'images': {
+            path.name: file_hash(path) for path in sorted(Path(images_dir).glob('*.png'))
+        },
+    }
+
+
+class OdooCloner:
+    """Clones databases through Odoo's database service (includes the filestore)"""
+    
+    def __init__(self, url, master_password):
+        self.url = url
+        self.master_password = master_password
+        self.db = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/db')
+    
+    def exists(self, name):
+        return bool(self.db.db_exist(name))
+    
+    def clone(self, source, target):
+        self.db.duplicate_database(self.master_password, source, target)
+    
+    def drop(self, name):
+        if self.exists(name):
+            self.db.drop(self.master_password, name)
+
+
+class PostgresCloner:
+    """Clones databases with PostgreSQL template databases
+    
+    psql and exec_prefix are command prefixes, e.g. 'docker exec -i odoo_db
+    psql -U odoo' to reach the compose database, or plain 'psql' with the
+    usual PG* environment variables for a local server.
+    """
+    
+    def __init__(self, psql='psql', filestore=None, exec_prefix=None):
+        self.psql = shlex.split(psql)
+        self.filestore = filestore
+        self.exec_prefix = shlex.split(exec_prefix) if exec_prefix else None
+    
+    def _sql(self, sql):
+        result = subprocess.run(
+            [*self.psql, '-v', 'ON_ERROR_STOP=1', '-At', '-d', 'postgres', '-c', sql],
+            check=True, capture_output=True, text=True
+        )
+        return result.stdout.strip()
+    
+    @staticmethod
+    def _ident(name):
+        return '"' + name.replace('"', '""') + '"'
+    
+    @staticmethod
+    def _literal(name):
+        return "'" + name.replace("'", "''") + "'"
+    
+    def exists(self, name):
+        return self._sql(f"SELECT 1 FROM pg_database WHERE datname = {self._literal(name)}") == '1'
+    
+    def clone(self, source, target):
+        # A template database cannot have open connections while it is copied
+        self._sql(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            f"WHERE datname = {self._literal(source)} AND pid <> pg_backend_pid()"
+        )
+        self._sql(f"CREATE DATABASE {self._ident(target)} TEMPLATE {self._ident(source)}")
+        self._copy_filestore(source, target)
+    
+    def drop(self, name):
+        self._sql(f"DROP DATABASE IF EXISTS {self._ident(name)} WITH (FORCE)")
+        if self.filestore:
+            self._run_filestore(['rm', '-rf', f'{self.filestore}/{name}'])
+    
+    def _copy_filestore(self, source, target):
+        if not self.filestore:
+            return
+        if self.exec_prefix:
+            self._run_filestore(['cp', '-a', f'{self.filestore}/{source}', f'{self.filestore}/{target}'])
+        elif (Path(self.filestore) / source).exists():
+            shutil.copytree(Path(self.filestore) / source, Path(self.filestore) / target)
+    
+    def _run_filestore(self, command):
+        if self.exec_prefix:
+            subprocess.run([*self.exec_prefix, *command], check=True)
+        else:
+            subprocess.run(command, check=True)
+
+
+def create_snapshot(cloner, db, name=None, products_file=PRODUCTS_FILE, images_dir=IMAGES_DIR):
+    """Capture db as a snapshot database and record its inputs"""
+    name = name or f'{db}_snapshot'
+    print(f"📸 Snapshotting {db} → {name}...")
+    
+    started = time.perf_counter()
+    cloner.drop(name)
+    cloner.clone(db, name)
+    
+    manifest = {
+        'name': name,
+        'source': db,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'backend': type(cloner).__name__,
+        'fingerprint': fingerprint(products_file, images_dir),
+    }
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+    (SNAPSHOT_DIR / f'{name}.json').write_text(json.dumps(manifest, indent=2))
+    
+    print(f"   ✅ Snapshot ready in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+def load_manifest(name):
+    """Load a snapshot manifest"""
+    path = SNAPSHOT_DIR / f'{name}.json'
+    if not path.exists():
+        raise Exception(f"Snapshot not found: {name}")
+    return json.loads(path.read_text())
+
+
+def apply_incremental(url, db, username, password, manifest,
+                      products_file=PRODUCTS_FILE, images_dir=IMAGES_DIR):
+    """Bring a cloned database up to date with inputs changed since the snapshot"""
+    current = fingerprint(products_file, images_dir)
+    recorded = manifest['fingerprint']
+    changes = {'created': 0, 'updated': 0, 'archived': 0, 'images': 0, 'photos': 0}
+    
+    new_skus = [s for s in current['products'] if s not in recorded['products']]
+    # Snapshots taken before photos were fingerprinted re-upload every photo once
+    recorded_photos = recorded.get('photos', {})
+    changed_photos = {s for s, h in current['photos'].items() if recorded_photos.get(s) != h}
+    changed_skus = [
+        s for s, h in current['products'].items()
+        if s in recorded['products'] and (recorded['products'][s] != h or s in changed_photos)
+    ]
+    removed_skus = [s for s in recorded['products'] if s not in current['products']]
+    changed_images = [n for n, h in current['images'].items() if recorded['images'].get(n) != h]
+    
+    if not (new_skus or changed_skus or removed_skus or changed_images):
+        print("   ✅ Snapshot is up to date, nothing to apply")
+        return changes
+    
+    uid, models = connect_odoo(url, db, username, password)
+    with open(products_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    by_sku = {p['sku']: p for p in data['products']}
+    
+    if new_skus:
+        # Reuse the regular import for products the snapshot has never seen
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as tmp:
+            json.dump({'products': [by_sku[s] for s in new_skus]}, tmp)
+        try:
+            changes['created'], _ = import_products(url, db, username, password, tmp.name)
+        finally:
+            Path(tmp.name).unlink()
+    
+    if changed_skus or removed_skus:
+        records = models.execute_kw(
+            db, uid, password,
+            'product.template', 'search_read',
+            [[('default_code', 'in', changed_skus + removed_skus)]],
+            {'fields': ['id', 'default_code'], 'context': {'active_test': False}}
+        )
+        ids = {r['default_code']: r['id'] for r in records}
+        
+        taxonomy = TaxonomyResolver(models, db, uid, password, url)
+        taxonomy.preload([by_sku[s] for s in changed_skus])
+        for sku in changed_skus:
+            if sku in ids:
+                product = by_sku[sku]
+                values = {
+                    'name': product['name'],
+                    'list_price': float(product['price']),
+                    'description_sale': product['description'],
+                    **taxonomy.product_values(product),
+                }
+                if 'attribute_line_ids' in values:
+                    # Replace the brand line instead of adding a second one
+                    values['attribute_line_ids'] = [(5, 0, 0)] + values['attribute_line_ids']
+                if sku in changed_photos:
+                    values['image_1920'] = StreamedFile(product['image_path'])
+                    changes['photos'] += 1
+                models.execute_kw(
+                    db, uid, password,
+                    'product.template', 'write',
+                    [[ids[sku]], values]
+                )
+                changes['updated'] += 1
+        
+        archive_ids = [ids[s] for s in removed_skus if s in ids]
+        if archive_ids:
+            models.execute_kw(
+                db, uid, password,
+                'product.template', 'write',
+                [archive_ids, {'active': False}]
+            )
+            changes['archived'] = len(archive_ids)
+    
+    # Pages link site images by attachment ID, so changed files are written
+    # into the existing attachments rather than uploaded as new ones
+    attachment_names = {filename: name for name, filename in SITE_IMAGES.items()}
+    for filename in changed_images:
+        name = attachment_names.get(filename, Path(filename).stem)
+        attachment_ids = models.execute_kw(
+            db, uid, password,
+            'ir.attachment', 'search',
+            [[('name', '=', name), ('res_model', '=', 'ir.ui.view')]]
+        )
+        if attachment_ids:
+            models.execute_kw(
+                db, uid, password,
+                'ir.attachment', 'write',
+                [attachment_ids, {'datas': StreamedFile(Path(images_dir) / filename)}]
+            )
+        else:
+            upload_image(models, db, uid, password, Path(images_dir) / filename, name)
+        changes['images'] += 1
+    
+    print(f"   ✅ Applied: {changes['created']} created, {changes['updated']} updated "
+          f"({changes['photos']} photos), {changes['archived']} archived, {changes['images']} images")
+    return changes
+
+
+def provision(cloner, snapshot, target, url, username, password, incremental=True):
+    """Create target from a snapshot, then apply only what changed"""
+    print(f"🚀 Provisioning {target} from {snapshot}...")
+    manifest = load_manifest(snapshot)
+    
+    started = time.perf_counter()
+    if cloner.exists(target):
+        raise Exception(f"Database already exists: {target}")
+    cloner.clone(snapshot, target)
+    cloned = time.perf_counter() - started
+    print(f"   ✅ Cloned in {cloned:.1f}s")
+    
+    changes = None
+    if incremental:
+        wait_for_odoo(url, target, username, password, quiet=True)
+        changes = apply_incremental(url, target, username, password, manifest)
+    
+    total = time.perf_counter() - started
+    print(f"   ⏱️  Ready in {total:.1f}s")
+    return {'target': target, 'clone_seconds': round(cloned, 2),
+            'total_seconds': round(total, 2), 'changes': changes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('action', choices=['snapshot', 'provision', 'drop', 'list'])
+    parser.add_argument('--url', default="http://localhost:8069")
+    parser.add_argument('--db', default="bearings", help='Source database to snapshot')
+    parser.add_argument('--snapshot', help='Snapshot name (default: <db>_snapshot)')
+    parser.add_argument('--target', help='Database to provision or drop')
+    parser.add_argument('--username', default="admin")
+    parser.add_argument('--password', default="admin")
+    parser.add_argument('--master-password', default="admin")
+    parser.add_argument('--backend', choices=['odoo', 'postgres'], default='odoo')
+    parser.add_argument('--psql', default='psql', help='psql command for the postgres backend')
+    parser.add_argument('--filestore', help='Filestore root for the postgres backend')
+    parser.add_argument('--exec', dest='exec_prefix', help='Command prefix for filestore copies')
+    parser.add_argument('--no-incremental', action='store_true')
+    args = parser.parse_args()
+    
+    print("🗄️  Bearings Inc - Database Snapshots")
+    print("=" * 70)
+    
+    if args.action == 'list':
+        for path in sorted(SNAPSHOT_DIR.glob('*.json')):
+            manifest = json.loads(path.read_text())
+            print(f"   {manifest['name']} (from {manifest['source']}, {manifest['created_at']}, "
+                  f"{len(manifest['fingerprint']['products'])} products)")
+        exit(0)
+    
+    if args.backend == 'postgres':
+        cloner = PostgresCloner(args.psql, args.filestore, args.exec_prefix)
+    else:
+        wait_for_odoo(args.url, quiet=True)
+        cloner = OdooCloner(args.url, args.master_password)
+    
+    snapshot = args.snapshot or f'{args.db}_snapshot'
+    
+    try:
+        if args.action == 'snapshot':
+            create_snapshot(cloner, args.db, snapshot)
+        elif args.action == 'provision':
+            if not args.target:
+                parser.error('--target is required')
+            provision(cloner, snapshot, args.target, args.url, args.username, args.password,
+                      incremental=not args.no_incremental)
+        elif args.action == 'drop':
+            if not args.target:
+                parser.error('--target is required')
+            cloner.drop(args.target)
+            print(f"   ✅ Dropped {args.target}")
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        exit(1)
+    
+    exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Stock Level Sync - Bearings Inc
+Consumes warehouse stock deltas, coalesces them per SKU and applies on-hand
+quantities to Odoo in bulk
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+from import_products import connect_odoo
+from odoo_ready import wait_for_odoo
+from rpc_tracing import report_rpc_metrics
+from taxonomy import cache_path
+
+# One file per Odoo URL and database in each directory
+STATE_DIR = '.stock_sync_state'
+INDEX_DIR = '.stock_sku_index'
+
+
+def load_for_database(path, database_uuid):
+    """Contents of a per-target file, or None when it belongs to another database"""
+    data = json.loads(path.read_text()) if path.exists() else None
+    if data is None or data.get('database_uuid') != database_uuid:
+        return None
+    return data
+
+
+class SkuIndex:
+    """SKU → product.product ID map, cached on disk between runs
+    
+    Tied to the database UUID, so a snapshot clone or rebuilt database
+    never reuses IDs that belong to other products.
+    """
+    
+    def __init__(self, models, db, uid, password, url, database_uuid, index_dir=INDEX_DIR):
+        self.models = models
+        self.db = db
+        self.uid = uid
+        self.password = password
+        self.database_uuid = database_uuid
+        self.path = cache_path(index_dir, url, db)
+        data = load_for_database(self.path, database_uuid)
+        self.ids = data['ids'] if data else {}
+    
+    def resolve(self, skus):
+        """Return {sku: product_id}, looking up unknown SKUs in one call"""
+        missing = [s for s in skus if s not in self.ids]
+        if missing:
+            found = self.models.execute_kw(
+                self.db, self.uid, self.password,
+                'product.product', 'search_read',
+                [[('default_code', 'in', missing)]],
+                {'fields': ['default_code']}
+            )
+            for product in found:
+                self.ids[product['default_code']] = product['id']
+            self.save()
+        return {s: self.ids[s] for s in skus if s in self.ids}
+    
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({'database_uuid': self.database_uuid, 'ids': self.ids}))
+
+
+class Coalescer:
+    """Merges stock events per SKU within a time window
+    
+    Events carry either a 'delta' or an absolute 'qty'. An absolute quantity
+    replaces everything buffered before it for that SKU.
+    """
+    
+    def __init__(self):
+        self.pending = {}
+        self.first_at = None
+        self.last_event_id = None
+        self.event_ids = set()
+        self.events = 0
+    
+    def seen(self, event_id):
+        """Whether an event with this ID is already buffered"""
+        return event_id is not None and event_id in self.event_ids
+    
+    def add(self, event):
+        sku = event['sku']
+        entry = self.pending.setdefault(sku, {'qty': None, 'delta': 0.0})
+        if 'qty' in event:
+            entry['qty'] = float(event['qty'])
+            entry['delta'] = 0.0
+        else:
+            entry['delta'] += float(event['delta'])
+        
+        if self.first_at is None:
+            self.first_at = time.monotonic()
+        if event.get('event_id') is not None:
+            self.last_event_id = max(self.last_event_id or 0, event['event_id'])
+            self.event_ids.add(event['event_id'])
+        self.events += 1
+    
+    def due(self, window, max_skus):
+        if not self.pending:
+            return False
+        return len(self.pending) >= max_skus or time.monotonic() - self.first_at >= window
+    
+    def drain(self):
+        pending, self.pending, self.first_at = self.pending, {}, None
+        # Drained IDs are covered by the checkpoint from here on
+        self.event_ids = set()
+        return pending
+
+
+class StockSync:
+    """Applies coalesced stock levels with write-ahead checkpoints"""
+    
+    def __init__(self, url, db, username, password, state_dir=STATE_DIR,
+                 index_dir=INDEX_DIR, batch_size=500):
+        self.db = db
+        self.password = password
+        self.uid, self.models = connect_odoo(url, db, username, password)
+        database_uuid = self._call('ir.config_parameter', 'get_param', ['database.uuid'])
+        self.index = SkuIndex(self.models, db, self.uid, password, url, database_uuid, index_dir)
+        # Checkpoints (offset, last event ID, pending batch) only hold for the database they came from
+        self.state_path = cache_path(state_dir, url, db)
+        self.state = load_for_database(self.state_path, database_uuid) or {
+            'database_uuid': database_uuid, 'offset': 0, 'last_event_id': 0, 'pending': None
+        }
+        self.batch_size = batch_size
+        self.location_id = None
+        self.stats = {'events': 0, 'duplicates': 0, 'skus_applied': 0,
+                      'unknown_skus': 0, 'batches': 0}
+    
+    def _call(self, model, method, args, kwargs=None):
+        return self.models.execute_kw(self.db, self.uid, self.password, model, method, args, kwargs or {})
+    
+    def save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.state))
+        tmp.replace(self.state_path)
+    
+    def stock_location(self):
+        if self.location_id is None:
+            warehouses = self._call('stock.warehouse', 'search_read', [[]],
+                                    {'fields': ['lot_stock_id'], 'limit': 1})
+            if not warehouses:
+                raise Exception("No warehouse found")
+            self.location_id = warehouses[0]['lot_stock_id'][0]
+        return self.location_id
+    
+    def is_duplicate(self, event, coalescer):
+        """Events at or below the checkpointed ID were already applied, and
+        events already buffered in the current window were already counted"""
+        event_id = event.get('event_id')
+        duplicate = event_id is not None and (event_id <= self.state['last_event_id']
+                                              or coalescer.seen(event_id))
+        if duplicate:
+            self.stats['duplicates'] += 1
+        return duplicate
+    
+    def recover(self):
+        """Re-apply a batch that was interrupted before its checkpoint"""
+        pending = self.state.get('pending')
+        if pending:
+            print(f"   🔁 Re-applying interrupted batch ({len(pending['targets'])} products)")
+            self._apply_targets({int(k): v for k, v in pending['targets'].items()})
+            self.state['last_event_id'] = max(self.state['last_event_id'], pending['last_event_id'] or 0)
+            self.state['offset'] = pending['offset']
+            self.state['pending'] = None
+            self.save_state()
+    
+    def flush(self, coalescer, offset):
+        """Turn buffered deltas into absolute targets and apply them"""
+        last_event_id = coalescer.last_event_id
+        pending = coalescer.drain()
+        if not pending:
+            return
+        
+        skus = list(pending)
+        ids = self.index.resolve(skus)
+        unknown = [s for s in skus if s not in ids]
+        if unknown:
+            self.stats['unknown_skus'] += len(unknown)
+            print(f"   ⚠️  {len(unknown)} unknown SKUs (e.g. {', '.join(unknown[:3])})")
+        
+        location_id = self.stock_location()
+        product_ids = list(ids.values())
+        current = {}
+        for start in range(0, len(product_ids), self.batch_size):
+            quants = self._call('stock.quant', 'search_read', [[
+                ('product_id', 'in', product_ids[start:start + self.batch_size]),
+                ('location_id', '=', location_id),
+            ]], {'fields': ['product_id', 'quantity']})
+            for quant in quants:
+                product_id = quant['product_id'][0]
+                current[product_id] = current.get(product_id, 0.0) + quant['quantity']
+        
+        targets = {}
+        for sku, product_id in ids.items():
+            entry = pending[sku]
+            base = entry['qty'] if entry['qty'] is not None else current.get(product_id, 0.0)
+            targets[product_id] = base + entry['delta']
+        
+        # Write-ahead: absolute targets are safe to apply again after a crash
+        self.state['pending'] = {'targets': targets, 'last_event_id': last_event_id, 'offset': offset}
+        self.save_state()
+        
+        self._apply_targets(targets)
+        
+        if last_event_id is not None:
+            self.state['last_event_id'] = max(self.state['last_event_id'], last_event_id)
+        self.state['offset'] = offset
+        self.state['pending'] = None
+        self.save_state()
+        
+        self.stats['skus_applied'] += len(targets)
+        print(f"   ✅ Applied {len(targets)} products from {coalescer.events} events")
+        coalescer.events = 0
+        coalescer.last_event_id = None
+    
+    def _apply_targets(self, targets):
+        location_id = self.stock_location()
+        items = list(targets.items())
+        context = {'inventory_mode': True}
+        
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            # In inventory mode, create updates the existing quant when there is one
+            quant_ids = self._call('stock.quant', 'create', [[
+                {'product_id': product_id, 'location_id': location_id, 'inventory_quantity': qty}
+                for product_id, qty in batch
+            ]], {'context': context})
+            self._call('stock.quant', 'action_apply_inventory', [quant_ids], {'context': context})
+            self.stats['batches'] += 1
+
+
+def read_events(source, offset, follow, poll=0.2):
+    """Yield (event or None, offset) from a JSON lines file or stdin
+    
+    None is yielded while waiting for more input so callers can flush.
+    """
+    if source == '-':
+        # A reader thread lets an idle stream still yield None every poll
+        lines = queue.Queue()
+        
+        def pump():
+            for line in sys.stdin:
+                lines.put(line)
+            lines.put(None)
+        
+        threading.Thread(target=pump, daemon=True).start()
+        while True:
+            try:
+                line = lines.get(timeout=poll)
+            except queue.Empty:
+                yield None, 0
+                continue
+            if line is None:
+                return
+            if line.strip():
+                yield json.loads(line), 0
+    
+    with open(source, 'rb') as f:
+        f.seek(offset)
+        while True:
+            line = f.readline()
+            if line and line.endswith(b'\n'):
+                offset = f.tell()
+                if line.strip():
+                    yield json.loads(line), offset
+                continue
+            if line:
+                # Partial line still being written
+                f.seek(offset)
+            if not follow:
+                return
+            yield None, offset
+            time.sleep(poll)
+
+
+def sync_stock(url, db, username, password, source, follow=False, window=2.0,
+               max_skus=5000, batch_size=500, state_dir=STATE_DIR, index_dir=INDEX_DIR):
+    """Consume stock events and keep Odoo on-hand quantities in sync"""
+    print("📦 Bearings Inc - Stock Sync")
+    print("=" * 70)
+    
+    sync = StockSync(url, db, username, password, state_dir, index_dir, batch_size)
+    sync.recover()
+    
+    coalescer = Coalescer()
+    offset = sync.state['offset'] if source != '-' else 0
+    print(f"\n📥 Reading {source} from offset {offset}...")
+    
+    try:
+        for event, offset in read_events(source, offset, follow):
+            if event is not None and not sync.is_duplicate(event, coalescer):
+                coalescer.add(event)
+                sync.stats['events'] += 1
+            if coalescer.due(window, max_skus):
+                sync.flush(coalescer, offset)
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping...")
+    
+    sync.flush(coalescer, offset)
+    
+    print("\n" + "=" * 70)
+    print("📊 Sync Summary:")
+    print(f"   Events: {sync.stats['events']} ({sync.stats['duplicates']} duplicates skipped)")
+    print(f"   Products updated: {sync.stats['skus_applied']}")
+    print(f"   Apply batches: {sync.stats['batches']}")
+    print(f"   Unknown SKUs: {sync.stats['unknown_skus']}")
+    
+    return sync.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('source', help="JSON lines file of stock events, or '-' for stdin")
+    parser.add_argument('--follow', action='store_true', help='Keep reading as the file grows')
+    parser.add_argument('--window', type=float, default=2.0, help='Seconds to coalesce events')
+    parser.add_argument('--max-skus', type=int, default=5000, help='Flush early at this many SKUs')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--state-dir', default=STATE_DIR, help='Checkpoints, one file per URL and database')
+    parser.add_argument('--index-dir', default=INDEX_DIR, help='SKU index, one file per URL and database')
+    args = parser.parse_args()
+    
+    URL = "http://localhost:8069"
+    DB = "bearings"
+    USERNAME = "admin"
+    PASSWORD = "admin"
+    
+    try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
+        sync_stock(URL, DB, USERNAME, PASSWORD, args.source, args.follow, args.window,
+                   args.max_skus, args.batch_size, args.state_dir, args.index_dir)
+        report_rpc_metrics()
+        exit(0)
+    except Exception as e:
+        print(f"\n❌ Fatal error: {str(e)}")
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
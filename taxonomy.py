@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Taxonomy Resolver - Bearings Inc
+Maps category and brand names to Odoo IDs in bulk, creating what is missing,
+with the name → ID map cached on disk between runs
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from urllib.parse import urlsplit
+
+CACHE_DIR = '.taxonomy_cache'
+BRAND_ATTRIBUTE = 'Brand'
+
+
+def cache_path(cache_dir, url, db):
+    """Cache file for one URL and database, e.g. bearings@odoo_8069-1a2b3c4d5e6f.json"""
+    digest = hashlib.sha1(f'{url}|{db}'.encode()).hexdigest()[:12]
+    name = re.sub(r'[^\w.@-]', '_', f'{db}@{urlsplit(url).netloc}')
+    return Path(cache_dir) / f'{name}-{digest}.json'
+
+
+class TaxonomyResolver:
+    """Resolves website categories, internal categories and brand values
+    
+    Names already in the cache cost no RPC calls. Unknown names are looked
+    up with one search_read per model, and whatever is still missing is
+    created in one batch. Each URL and database gets its own cache file, tied
+    to the database UUID, so a recreated database never reuses stale IDs and
+    tenants running side by side never share a file.
+    """
+    
+    def __init__(self, models, db, uid, password, url, cache_dir=CACHE_DIR):
+        self.models = models
+        self.db = db
+        self.uid = uid
+        self.password = password
+        self.url = url
+        self.path = cache_path(cache_dir, url, db)
+        self.created = {'public_categories': 0, 'categories': 0, 'brands': 0}
+        self.ids = self._load()
+    
+    def _call(self, model, method, args, kwargs=None):
+        return self.models.execute_kw(self.db, self.uid, self.password, model, method, args, kwargs or {})
+    
+    def _load(self):
+        database_uuid = self._call('ir.config_parameter', 'get_param', ['database.uuid'])
+        cache = json.loads(self.path.read_text()) if self.path.exists() else {}
+        if (cache.get('database_uuid'), cache.get('url'), cache.get('db')) != (database_uuid, self.url, self.db):
+            cache = {'database_uuid': database_uuid, 'url': self.url, 'db': self.db}
+        for kind in ('public_categories', 'categories', 'attributes', 'brands'):
+            cache.setdefault(kind, {})
+        return cache
+    
+    def save(self):
+        """Write the cache through a uniquely named temp file and an atomic rename
+        
+        Concurrent runs against the same target can only lose each other's
+        additions, which costs a search on the next run, never a wrong ID.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=self.path.parent, prefix=self.path.stem,
+                                         suffix='.tmp', delete=False) as tmp:
+            tmp.write(json.dumps(self.ids, indent=2, sort_keys=True))
+        os.replace(tmp.name, self.path)
+    
+    def _resolve(self, kind, model, names, domain=None, defaults=None):
+        """Return {name: id} for names, searching and creating only cache misses"""
+        known = self.ids[kind]
+        missing = sorted({n for n in names if n and n not in known})
+        if missing:
+            found = self._call(model, 'search_read', [[('name', 'in', missing)] + (domain or [])],
+                               {'fields': ['name']})
+            for record in found:
+                known.setdefault(record['name'], record['id'])
+            
+            to_create = [n for n in missing if n not in known]
+            if to_create:
+                new_ids = self._call(model, 'create', [[{'name': n, **(defaults or {})} for n in to_create]])
+                known.update(zip(to_create, new_ids))
+                if kind in self.created:
+                    self.created[kind] += len(to_create)
+            self.save()
+        return {n: known[n] for n in names if n in known}
+    
+    def public_categories(self, names):
+        """Website categories (product.public.category)"""
+        return self._resolve('public_categories', 'product.public.category', names)
+    
+    def categories(self, names):
+        """Internal product categories (product.category)"""
+        return self._resolve('categories', 'product.category', names)
+    
+    def brand_attribute(self):
+        ids = self._resolve('attributes', 'product.attribute', [BRAND_ATTRIBUTE],
+                            defaults={'create_variant': 'no_variant'})
+        return ids[BRAND_ATTRIBUTE]
+    
+    def brands(self, names):
+        """Values of the Brand attribute (product.attribute.value)"""
+        attribute_id = self.brand_attribute()
+        return self._resolve('brands', 'product.attribute.value', names,
+                             domain=[('attribute_id', '=', attribute_id)],
+                             defaults={'attribute_id': attribute_id})
+    
+    def preload(self, products):
+        """Resolve the taxonomy of every product up front"""
+        categories = {p['category'] for p in products if p.get('category')}
+        self.public_categories(categories)
+        self.categories(categories)
+        self.brands({p['brand'] for p in products if p.get('brand')})
+    
+    def product_values(self, product):
+        """product.template values linking a product to its taxonomy"""
+        values = {}
+        category = product.get('category')
+        if category:
+            values['public_categ_ids'] = [(6, 0, [self.public_categories([category])[category]])]
+            values['categ_id'] = self.categories([category])[category]
+        brand = product.get('brand')
+        if brand:
+            values['attribute_line_ids'] = [(0, 0, {
+                'attribute_id': self.brand_attribute(),
+                'value_ids': [(6, 0, [self.brands([brand])[brand]])],
+            })]
+        return values
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Storefront Cache Warmer - Bearings Inc
+Pre-requests shop pages, product pages and image sizes of new or changed
+products so the first real visitor does not pay for cold rendering
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from diagnose_website import percentile, timed_fetch
+from import_products import connect_odoo, read_all
+from odoo_ready import wait_for_odoo
+
+IMAGE_SIZES = (128, 256, 512, 1024)
+PRODUCTS_PER_PAGE = 20
+
+# write_date comes from the Odoo server's clock; starting a little early
+# means a local clock running ahead cannot hide products written by a push
+CLOCK_SKEW_MARGIN = timedelta(minutes=5)
+
+
+def odoo_now(margin=CLOCK_SKEW_MARGIN):
+    """Current UTC time minus margin, in Odoo's write_date format"""
+    return (datetime.now(timezone.utc) - margin).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def warm_urls(models, db, uid, password, since=None, product_pages=True):
+    """List storefront URLs to warm for products written since a timestamp
+    
+    Shop listing pages are always included since new products move them.
+    With product_pages=False only the home, shop and category pages are listed.
+    """
+    published = models.execute_kw(
+        db, uid, password,
+        'product.template', 'search_count',
+        [[('website_published', '=', True)]]
+    )
+    pages = max(1, -(-published // PRODUCTS_PER_PAGE))
+    urls = ['/', '/shop'] + [f'/shop/page/{n}' for n in range(2, pages + 1)]
+    
+    if not product_pages:
+        categories = models.execute_kw(
+            db, uid, password,
+            'product.public.category', 'search',
+            [[]]
+        )
+        return urls + [f'/shop/category/{c}' for c in categories], 0
+    
+    domain = [('website_published', '=', True)]
+    if since:
+        domain.append(('write_date', '>=', since))
+    products = read_all(models, db, uid, password, 'product.template', domain,
+                        ['website_url', 'public_categ_ids'])
+    
+    categories = sorted({c for p in products for c in (p['public_categ_ids'] or [])})
+    urls += [f'/shop/category/{c}' for c in categories]
+    for product in products:
+        urls.append(product['website_url'] or f"/shop/{product['id']}")
+        urls += [f"/web/image/product.template/{product['id']}/image_{size}" for size in IMAGE_SIZES]
+    
+    return urls, len(products)
+
+
+def fetch_all(base_url, paths, concurrency, timeout):
+    """Fetch paths with bounded concurrency, returning one record per path"""
+    def fetch(path):
+        try:
+            record, _ = timed_fetch(base_url.rstrip('/') + path, timeout)
+            return record
+        except Exception as e:
+            return {'url': base_url + path, 'page_type': 'error', 'status': None,
+                    'total_ms': None, 'error': str(e)}
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(fetch, paths))
+
+
+def latency_report(records):
+    """{page_type: {count, p50_ms, p95_ms, errors}}"""
+    report = {}
+    for record in records:
+        entry = report.setdefault(record['page_type'], {'count': 0, 'times': [], 'errors': 0})
+        entry['count'] += 1
+        if record['status'] is None or record['status'] >= 400:
+            entry['errors'] += 1
+        if record['total_ms'] is not None:
+            entry['times'].append(record['total_ms'])
+    
+    return {
+        page_type: {
+            'count': entry['count'],
+            'p50_ms': percentile(entry['times'], 50),
+            'p95_ms': percentile(entry['times'], 95),
+            'errors': entry['errors'],
+        }
+        for page_type, entry in report.items()
+    }
+
+
+def warm_cache(url, db, username, password, since=None, concurrency=8, timeout=30,
+               verify_sample=50, product_pages=True):
+    """Warm storefront pages and image variants, then compare with a second hit"""
+    print("\n🔥 Warming storefront cache...")
+    started = time.perf_counter()
+    
+    uid, models = connect_odoo(url, db, username, password)
+    paths, product_count = warm_urls(models, db, uid, password, since, product_pages)
+    if product_pages:
+        scope = f"changed since {since}" if since else "in the catalog"
+        print(f"   {product_count} products {scope}, {len(paths)} URLs")
+    else:
+        print(f"   Home, shop and category pages, {len(paths)} URLs")
+    
+    first = fetch_all(url, paths, concurrency, timeout)
+    first_report = latency_report(first)
+    
+    # Re-request a sample: warm pages should now answer at steady-state speed
+    sample = random.sample(paths, min(verify_sample, len(paths)))
+    second_report = latency_report(fetch_all(url, sample, concurrency, timeout))
+    
+    print(f"   {'Type':<10} {'URLs':>6} {'first p50':>10} {'first p95':>10} {'warm p50':>9} {'errors':>7}")
+    for page_type, stats in sorted(first_report.items()):
+        warm = second_report.get(page_type, {}).get('p50_ms')
+        print(f"   {page_type:<10} {stats['count']:>6} {_ms(stats['p50_ms']):>10} "
+              f"{_ms(stats['p95_ms']):>10} {_ms(warm):>9} {stats['errors']:>7}")
+    
+    elapsed = time.perf_counter() - started
+    errors = sum(s['errors'] for s in first_report.values())
+    print(f"   ✅ Warmed {len(paths)} URLs in {elapsed:.1f}s ({errors} errors)")
+    
+    return {'urls': len(paths), 'products': product_count, 'seconds': round(elapsed, 2),
+            'first_hit': first_report, 'warm_hit': second_report}
+
+
+def warming_enabled():
+    return os.environ.get('BEARINGS_WARM_CACHE', '1') not in ('0', 'false', 'no')
+
+
+def warm_after_push(url, db, username, password, since=None, product_pages=True):
+    """Warm the storefront after a catalog push unless BEARINGS_WARM_CACHE=0
+    
+    A failed warm-up only warns, the push itself already succeeded.
+    """
+    if not warming_enabled():
+        return None
+    try:
+        return warm_cache(url, db, username, password, since, product_pages=product_pages)
+    except Exception as e:
+        print(f"   ⚠️  Cache warm-up failed: {str(e)}")
+        return None
+
+
+def _ms(value):
+    return '-' if value is None else f'{value:.0f}ms'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--since', help="Only products written since 'YYYY-MM-DD HH:MM:SS' (UTC)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--pages-only', action='store_true',
+                        help='Only warm the home, shop and category pages')
+    args = parser.parse_args()
+    
+    URL = "http://localhost:8069"
+    DB = "bearings"
+    USERNAME = "admin"
+    PASSWORD = "admin"
+    
+    try:
+        wait_for_odoo(URL, DB, USERNAME, PASSWORD)
+        warm_cache(URL, DB, USERNAME, PASSWORD, args.since, args.concurrency, args.timeout,
+                   product_pages=not args.pages_only)
+        exit(0)
+    except Exception as e:
+        print(f"\n❌ Fatal error: {str(e)}")
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()